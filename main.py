@@ -7,40 +7,68 @@ allowing remote control of Mammotion robotic mowers.
 
 import asyncio
 import logging
+import os
 import random
-import traceback
-from typing import Any, Dict, Optional
+import secrets
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
+from enum import Enum
 import json
 
-from fastapi import FastAPI, HTTPException, Depends
+import orjson
+from cryptography.fernet import Fernet
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from pymammotion.mammotion.devices.mammotion import Mammotion
-from pymammotion.aliyun.cloud_gateway import CloudIOTGateway, SetupException
+from pymammotion.mammotion.devices.mammotion import Mammotion, MammotionMixedDeviceManager
+from pymammotion.aliyun.cloud_gateway import CloudIOTGateway, SetupException, TooManyRequestsException
 from pymammotion.aliyun.model.dev_by_account_response import Device
 from pymammotion.data.model.device import MowingDevice
 from pymammotion.data.model.enums import ConnectionPreference
 from pymammotion.data.state_manager import StateManager
 from pymammotion.http.http import MammotionHTTP
 from pymammotion.http.model.camera_stream import StreamSubscriptionResponse, VideoResourceResponse
-from pymammotion.http.model.http import Response
 from pymammotion.mammotion.devices.mammotion_bluetooth import MammotionBaseBLEDevice
 from pymammotion.mammotion.devices.mammotion_cloud import MammotionBaseCloudDevice, MammotionCloud
 from pymammotion.mqtt import MammotionMQTT
 from pymammotion.utility.device_type import DeviceType
-from pymammotion.utility.constant.device_constant import WorkMode, device_mode
+from pymammotion.utility.constant.device_constant import WorkMode
+
+from src.utils.clock import coarse_isoformat, coarse_now
+from src.utils.mower import MOWER_PREFIXES, work_mode_name
 
 TIMEOUT_CLOUD_RESPONSE = 10
+STATUS_CACHE_TTL = 0.5  # seconds a /status snapshot is served to repeated polls
+SESSION_TTL = 86400  # seconds before an idle login session expires
+MAX_SESSIONS = 10_000
+SESSION_VALID_TTL = 30  # seconds a cloud session validity check is reused
+MQTT_CONNECT_TIMEOUT = 2.0  # seconds to wait for MQTT to connect before checking readiness
+MQTT_READY_TIMEOUT = 10.0
+COMMAND_IDLE_TIMEOUT = 300.0  # seconds a device's dispatcher waits for a command before exiting
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop the command dispatchers and release devices on shutdown."""
+    yield
+    await stop_command_dispatchers()
+    await shutdown_mammotion()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Mammotion Mower Control API",
     description="REST API for controlling Mammotion robotic mowers",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Pydantic models for request/response
@@ -59,15 +87,29 @@ class MowerStatus(BaseModel):
     device_name: str
     online: bool
     work_mode: str
-    work_mode_code: int
-    battery_level: int
-    charging_state: int
-    blade_status: bool
-    location: Optional[Dict[str, Any]] = None
+    # Readings are None while the device is offline, since its last report is stale
+    work_mode_code: Optional[int] = None
+    battery_level: Optional[int] = None
+    charging_state: Optional[int] = None
+    blade_status: Optional[bool] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    position_type: Optional[int] = None
+    orientation: Optional[int] = None
     work_progress: Optional[int] = None
     work_area: Optional[int] = None
     last_updated: datetime
 
+class StatusBatchRequest(BaseModel):
+    device_names: List[str] = Field(..., description="Names of the devices to read")
+
+class StatusBatchResponse(BaseModel):
+    statuses: List[MowerStatus]
+    errors: Dict[str, str] = {}
+
+# Last /status snapshot per device: device_name -> (monotonic timestamp, status)
+_status_cache: Dict[str, Tuple[float, MowerStatus]] = {}
+
 class CommandRequest(BaseModel):
     device_name: str = Field(..., description="Name of the device to control")
 
@@ -76,226 +118,396 @@ class CommandResponse(BaseModel):
     message: str
     command_sent: str
 
+class CommandAction(str, Enum):
+    """Commands accepted by POST /command/{action}."""
+    START_MOWING = "start_mowing"
+    STOP_MOWING = "stop_mowing"
+    RETURN_TO_DOCK = "return_to_dock"
+    PAUSE_MOWING = "pause_mowing"
+    RESUME_MOWING = "resume_mowing"
+
+@dataclass(slots=True)
+class Session:
+    """A logged-in user session."""
+    account: str
+    device_name: Optional[str]
+    # Stored encrypted, for re-authentication
+    password: Optional[bytes]
+    expires_at: float
+    created_at: float = field(default_factory=time.time)
+
 # Add this after the imports and before the session manager
 
 # Session manager for maintaining user sessions
 class MammotionSessionManager:
     def __init__(self):
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.sessions: Dict[str, Session] = {}
+        # Secondary index so account -> sessions lookups avoid scanning all sessions
+        self.account_index: Dict[str, Set[str]] = {}
+        # Most recent session per device, for lookups on the command path
+        self.by_device: Dict[str, str] = {}
+        # Most recent session per (account, device), for re-authentication
+        self.by_account_device: Dict[Tuple[str, str], str] = {}
         self.mammotion = Mammotion()
+        # Sessions live in this process only, so a generated key is enough
+        # unless one is supplied to keep ciphertexts stable across restarts
+        self._fernet = Fernet(os.environ.get("MOWER_SESSION_KEY") or Fernet.generate_key())
+        # Precomputed /devices listing and its encoded body, keyed on the device generation
+        self._devices_snapshot: Optional[Tuple[List[Dict[str, Any]], bytes]] = None
+        self._devices_generation: Optional[int] = None
     
     def create_session(self, account: str, device_name: Optional[str] = None, password: Optional[str] = None) -> str:
         """Create a new session for a user."""
-        session_id = f"{account}_{datetime.now().timestamp()}"
-        self.sessions[session_id] = {
-            "account": account,
-            "device_name": device_name,
-            "password": password,  # Store password for re-authentication
-            "created_at": datetime.now()
-        }
+        self._evict_sessions()
+        session_id = secrets.token_urlsafe(24)
+        self.sessions[session_id] = Session(
+            account=account,
+            device_name=device_name,
+            password=self._fernet.encrypt(password.encode()) if password else None,
+            expires_at=time.monotonic() + SESSION_TTL
+        )
+        self.account_index.setdefault(account, set()).add(session_id)
+        if device_name:
+            self.by_device[device_name] = session_id
+            self.by_account_device[(account, device_name)] = session_id
         return session_id
     
-    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+    def get_session(self, session_id: str) -> Optional[Session]:
         """Get session by ID."""
-        return self.sessions.get(session_id)
+        session = self.sessions.get(session_id)
+        if session is not None and session.expires_at <= time.monotonic():
+            self.remove_session(session_id)
+            return None
+        return session
+    
+    def get_by_device(self, device_name: str) -> Optional[Session]:
+        """Get the most recent session for a device."""
+        session_id = self.by_device.get(device_name)
+        if session_id is None:
+            return None
+        return self.get_session(session_id)
+    
+    def get_by_account_device(self, account: str, device_name: str) -> Optional[Session]:
+        """Get the most recent session an account opened for a device."""
+        session_id = self.by_account_device.get((account, device_name))
+        if session_id is None:
+            return None
+        return self.get_session(session_id)
+    
+    def get_password(self, session: Session) -> Optional[str]:
+        """Decrypt the password stored with a session."""
+        token = session.password
+        if token is None:
+            return None
+        return self._fernet.decrypt(token).decode()
+    
+    def get_sessions_by_account(self, account: str) -> Set[str]:
+        """Get the IDs of all sessions belonging to an account."""
+        return self.account_index.get(account, set())
     
     def remove_session(self, session_id: str) -> bool:
         """Remove a session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            return True
-        return False
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+        account_sessions = self.account_index.get(session.account)
+        if account_sessions is not None:
+            account_sessions.discard(session_id)
+            if not account_sessions:
+                del self.account_index[session.account]
+        if self.by_device.get(session.device_name) == session_id:
+            del self.by_device[session.device_name]
+        key = (session.account, session.device_name)
+        if self.by_account_device.get(key) == session_id:
+            del self.by_account_device[key]
+        return True
+    
+    def get_devices_snapshot(self, generation: int) -> Tuple[List[Dict[str, Any]], bytes]:
+        """Get the /devices listing and its JSON body, rebuilt only when the device generation changes."""
+        if self._devices_snapshot is None or generation != self._devices_generation:
+            devices = [
+                {
+                    "name": device_name,
+                    "iot_id": device.iot_id,
+                    "preference": str(device.preference),
+                    "has_cloud": device.has_cloud(),
+                    "has_ble": device.has_ble()
+                }
+                for device_name, device in self.mammotion.device_manager.devices.items()
+            ]
+            self._devices_snapshot = (devices, orjson.dumps({"devices": devices}))
+            self._devices_generation = generation
+        return self._devices_snapshot
+    
+    def _evict_sessions(self) -> None:
+        """Drop expired sessions and make room for a new one.
+        
+        Sessions are kept in insertion order with a fixed TTL, so expired
+        entries are always at the front and eviction stops at the first live one.
+        """
+        now = time.monotonic()
+        while self.sessions:
+            oldest_id, oldest = next(iter(self.sessions.items()))
+            if oldest.expires_at > now and len(self.sessions) < MAX_SESSIONS:
+                break
+            self.remove_session(oldest_id)
 
 # Global session manager
 session_manager = MammotionSessionManager()
 
-def get_session_manager() -> MammotionSessionManager:
-    """Dependency to get session manager."""
-    return session_manager
+# Bumped whenever login rebuilds the device managers, invalidating cached lookups and /devices
+_device_generation = 0
+
+@lru_cache(maxsize=64)
+def _resolve_device(generation: int, device_name: str) -> MammotionMixedDeviceManager:
+    """Look up a device manager by name for the given device generation."""
+    return session_manager.mammotion.get_device_by_name(device_name)
+
+def resolve_device(device_name: str) -> MammotionMixedDeviceManager:
+    """Get the device manager for a device name, memoized until the next login."""
+    return _resolve_device(_device_generation, device_name)
+
+def bump_device_generation() -> None:
+    """Invalidate memoized device lookups after the device set changes."""
+    global _device_generation
+    _device_generation += 1
+    _resolve_device.cache_clear()
+
+async def shutdown_mammotion() -> None:
+    """Stop device tasks and disconnect MQTT for the shared Mammotion client."""
+    mammotion = session_manager.mammotion
+    for device_name in list(mammotion.device_manager.devices):
+        try:
+            await mammotion.remove_device(device_name)
+        except Exception as e:
+            logger.warning("Failed to shut down device %s: %s", device_name, e)
+    bump_device_generation()
+
+def _is_rate_limited(e: Exception) -> bool:
+    """
+    Check whether an exception reports an HTTP 429 rate limit.
+    
+    Uses the exception type or a structured status code where the client
+    library provides one, and falls back to scanning the message.
+    """
+    if isinstance(e, TooManyRequestsException):
+        return True
+    status = getattr(e, "status_code", None) or getattr(e, "status", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429
+    message = str(e)
+    return "429" in message or "Too Many Requests" in message
 
-async def get_mammotion_instance() -> Mammotion:
-    """Dependency to get Mammotion instance."""
-    return session_manager.mammotion
+class RetryBudget:
+    """Retries and wall time shared by every step of one command's recovery path."""
+    
+    def __init__(self, max_attempts: int = 5, max_wall_time: float = 15.0):
+        self.remaining = max_attempts
+        self.deadline = time.monotonic() + max_wall_time
+    
+    @property
+    def exhausted(self) -> bool:
+        """Whether no retries or time are left."""
+        return self.remaining <= 0 or time.monotonic() >= self.deadline
+    
+    def time_left(self) -> float:
+        """Seconds left before the deadline."""
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def spend(self) -> None:
+        """Consume one retry."""
+        self.remaining -= 1
 
 async def exponential_backoff(
     func,
+    *args: Any,
     max_retries: int = 3,
-    initial_delay: float = 1.0,
-    max_delay: float = 10.0,
-    jitter: bool = True
+    initial_delay: float = 0.1,
+    max_delay: float = 2.0,
+    jitter: bool = True,
+    budget: Optional[RetryBudget] = None,
+    **kwargs: Any
 ) -> Optional[Any]:
-    """Execute function with exponential backoff retry logic."""
-    delay = initial_delay
+    """
+    Execute function with retry logic.
+    
+    Rate-limit errors (429) back off with decorrelated jitter; any other
+    error is retried once immediately and raised if it happens again.
+    When a budget is given, every retry spends from it and the error is
+    raised as soon as it runs out.
+    """
+    sleep_time = initial_delay
+    retried_error = False
     for attempt in range(max_retries):
         try:
-            return await func()
+            return await func(*args, **kwargs)
         except Exception as e:
-            if attempt == max_retries - 1:
+            if attempt == max_retries - 1 or (budget is not None and budget.exhausted):
                 raise
-            if "429" in str(e) or "Too Many Requests" in str(e):
-                sleep_time = min(delay * (2 ** attempt), max_delay)
+            if budget is not None and (_is_rate_limited(e) or not retried_error):
+                budget.spend()
+            if _is_rate_limited(e):
                 if jitter:
-                    sleep_time = random.uniform(0.5 * sleep_time, sleep_time)
-                logger.warning(f"Rate limited, retrying in {sleep_time:.1f}s (attempt {attempt + 1}/{max_retries})")
+                    sleep_time = min(max_delay, random.uniform(initial_delay, sleep_time * 3))
+                else:
+                    sleep_time = min(max_delay, initial_delay * (2 ** attempt))
+                if budget is not None:
+                    sleep_time = min(sleep_time, budget.time_left())
+                logger.warning("Rate limited, retrying in %.1fs (attempt %s/%s)", sleep_time, attempt + 1, max_retries)
                 await asyncio.sleep(sleep_time)
+            elif not retried_error:
+                retried_error = True
+                logger.warning("Retrying after error: %s (attempt %s/%s)", e, attempt + 1, max_retries)
             else:
                 raise
 
-async def refresh_session(session_id: str) -> None:
-    """
-    Refresh the session by resetting communication setup.
-    
-    Args:
-        session_id: The session ID to refresh
-    """
-    session = session_manager.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=401, detail="Invalid session")
-    
-    logger.info(f"Refreshing session {session_id}")
-    
-    try:
-        # Reset the communication setup flag
-        session["communication_setup"] = False
-        
-        logger.info(f"Session {session_id} communication reset")
-        
-    except Exception as e:
-        logger.error(f"Failed to refresh session {session_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Session refresh failed: {str(e)}")
+# Device bring-up commands as (command, kwargs), grouped into phases. Sync and
+# report setup must land before the report config and RTK pairing reads.
+_SETUP_PHASES = (
+    (
+        ("send_todev_ble_sync", {"sync_type": 3}),
+        ("get_report_cfg_stop", {}),
+    ),
+    (
+        ("get_report_cfg", {}),
+        ("read_and_set_rtk_paring_code", {"op": 1}),
+    ),
+)
 
+# Cloud devices whose communication setup has completed. Shared by every session
+# using the device; login's replace_mqtt creates a new cloud device, which starts unset.
+_setup_done: "weakref.WeakSet[MammotionBaseCloudDevice]" = weakref.WeakSet()
 
-async def setup_device_communication(device_manager) -> bool:
+async def setup_device_communication(device_name: str, cloud_device, budget: Optional[RetryBudget] = None) -> bool:
     """
     Set up device communication following the test script pattern.
     
+    Returns immediately if setup already completed for this cloud device.
+    
     Args:
-        device_manager: The device manager (MammotionMixedDeviceManager)
+        device_name: Name of the device
+        cloud_device: The device's cloud device (MammotionBaseCloudDevice)
+        budget: Retry budget shared with the rest of the command's recovery
         
     Returns:
         True if setup successful, False otherwise
     """
     try:
-        # Get the cloud device
-        cloud_device = device_manager.cloud()
         if not cloud_device:
             logger.error("No cloud device available")
             return False
+        
+        if cloud_device in _setup_done:
+            return True
             
-        logger.info(f"Setting up device communication for {device_manager.name}")
+        logger.info("Setting up device communication for %s", device_name)
         
         # Enable the device (it was set to stopped during creation)
         cloud_device.stopped = False
         
-        # Send initial sync commands with retry logic
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("send_todev_ble_sync", sync_type=3),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("get_report_cfg_stop"),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("get_report_cfg"),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("read_and_set_rtk_paring_code", op=1),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        # Additional sync commands
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("send_todev_ble_sync", sync_type=3),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("read_and_set_rtk_paring_code", op=1),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("read_and_set_rtk_paring_code", op=1),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("send_todev_ble_sync", sync_type=3),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(1)
-        
-        await exponential_backoff(
-            lambda: cloud_device.queue_command("read_and_set_rtk_paring_code", op=1),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        
-        logger.info(f"Device communication setup completed for {device_manager.name}")
+        # Commands within a phase are independent, so send them concurrently
+        for phase in _SETUP_PHASES:
+            results = await asyncio.gather(
+                *(
+                    exponential_backoff(cloud_device.queue_command, command, max_retries=3, budget=budget, **kwargs)
+                    for command, kwargs in phase
+                ),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        
+        _setup_done.add(cloud_device)
+        logger.info("Device communication setup completed for %s", device_name)
         return True
         
     except Exception as e:
-        logger.error(f"Failed to setup device communication for {device_manager.name}: {str(e)}")
+        logger.error("Failed to setup device communication for %s: %s", device_name, e)
         return False
 
-async def validate_mqtt_connection(device_manager) -> bool:
+# Connection state events per MQTT client: mqtt -> (connected, ready)
+_mqtt_events: "weakref.WeakKeyDictionary[MammotionCloud, Tuple[asyncio.Event, asyncio.Event]]" = weakref.WeakKeyDictionary()
+
+def _get_mqtt_events(mqtt: MammotionCloud) -> Tuple[asyncio.Event, asyncio.Event]:
+    """
+    Get asyncio events tracking an MQTT client's connected and ready state.
+    
+    The events are driven by the client's own connected/ready/disconnected
+    callbacks, so callers can await readiness instead of polling.
+    
+    Args:
+        mqtt: The MQTT client (MammotionCloud)
+        
+    Returns:
+        Tuple of (connected, ready) events
+    """
+    events = _mqtt_events.get(mqtt)
+    if events is None:
+        connected, ready = asyncio.Event(), asyncio.Event()
+        if mqtt.is_connected():
+            connected.set()
+        if mqtt.is_ready:
+            ready.set()
+        
+        async def on_connected() -> None:
+            connected.set()
+        
+        async def on_ready() -> None:
+            ready.set()
+        
+        async def on_disconnected() -> None:
+            connected.clear()
+            ready.clear()
+        
+        mqtt.on_connected_event.add_subscribers(on_connected)
+        mqtt.on_ready_event.add_subscribers(on_ready)
+        mqtt.on_disconnected_event.add_subscribers(on_disconnected)
+        events = _mqtt_events[mqtt] = (connected, ready)
+    return events
+
+async def validate_mqtt_connection(cloud_device, cloud_client) -> bool:
     """
     Validate that MQTT connection is ready for commands.
     
     Args:
-        device_manager: The device manager (MammotionMixedDeviceManager)
+        cloud_device: The device's cloud device (MammotionBaseCloudDevice)
+        cloud_client: The device's cloud client, if any
         
     Returns:
         True if connection is ready, False otherwise
     """
     try:
-        # Get the cloud device
-        cloud_device = device_manager.cloud()
         if not cloud_device:
             logger.error("No cloud device available")
             return False
         
         # Check if cloud session is valid
-        if hasattr(device_manager, 'cloud_client') and device_manager.cloud_client:
-            if not is_cloud_session_valid(device_manager.cloud_client):
+        if cloud_client:
+            if not is_cloud_session_valid(cloud_client):
                 logger.warning("Cloud session is not valid (missing identityId)")
                 return False
         
+        mqtt = cloud_device.mqtt
+        connected, ready = _get_mqtt_events(mqtt)
+        
         # Check if MQTT is connected
-        if not cloud_device.mqtt.is_connected():
+        if not mqtt.is_connected():
             logger.warning("MQTT not connected, attempting to connect...")
-            cloud_device.mqtt.connect_async()
-            await asyncio.sleep(2)  # Wait for connection
+            mqtt.connect_async()
+            try:
+                await asyncio.wait_for(connected.wait(), timeout=MQTT_CONNECT_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
         
         # Check if device is ready
-        if not cloud_device.mqtt.is_ready:
+        if not (mqtt.is_ready or ready.is_set()):
             logger.warning("MQTT not ready, waiting...")
-            # Wait for MQTT to be ready (up to 10 seconds)
-            for _ in range(10):
-                if cloud_device.mqtt.is_ready:
-                    break
-                await asyncio.sleep(1)
-            else:
+            try:
+                await asyncio.wait_for(ready.wait(), timeout=MQTT_READY_TIMEOUT)
+            except asyncio.TimeoutError:
                 logger.error("MQTT failed to become ready")
                 return False
         
@@ -303,10 +515,19 @@ async def validate_mqtt_connection(device_manager) -> bool:
         return True
         
     except Exception as e:
-        logger.error(f"MQTT connection validation failed: {str(e)}")
+        logger.error("MQTT connection validation failed: %s", e)
         return False
 
 
+# Command name -> (device command, kwargs) sent through the cloud device
+_COMMAND_MAP = {
+    "start_mowing": ("start_job", {}),
+    "stop_mowing": ("cancel_job", {}),
+    "pause_mowing": ("pause_execute_task", {}),
+    "resume_mowing": ("resume_execute_task", {}),
+    "return_to_dock": ("return_to_dock", {}),
+}
+
 async def handle_command_with_retry(mammotion: Mammotion, device_name: str, command: str, max_retries: int = 1) -> Any:
     """
     Execute a command with proper setup and retry logic.
@@ -323,92 +544,71 @@ async def handle_command_with_retry(mammotion: Mammotion, device_name: str, comm
     Raises:
         HTTPException: If command fails after retries
     """
+    command_spec = _COMMAND_MAP.get(command)
+    if command_spec is None:
+        raise HTTPException(status_code=400, detail=f"Unknown command: {command}")
+    device_command, command_kwargs = command_spec
+    
+    # Resolve the device and its cloud handles once; they are reused across retries
+    try:
+        device = resolve_device(device_name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Device '{device_name}' not found")
+    cloud_device = device.cloud()
+    if not cloud_device:
+        raise HTTPException(status_code=503, detail="Cloud device not available")
+    cloud_client = device.cloud_client
+    
+    # One budget bounds every retry below, including nested re-login and setup calls
+    budget = RetryBudget(max_attempts=5, max_wall_time=15.0)
+    
     for attempt in range(max_retries + 1):
         try:
-            logger.info(f"Executing command '{command}' for device '{device_name}' (attempt {attempt + 1})")
-            
-            # Get device
-            device = mammotion.get_device_by_name(device_name)
-            if not device:
-                raise HTTPException(status_code=404, detail=f"Device '{device_name}' not found")
-            
-            # Get the cloud device
-            cloud_device = device.cloud()
-            if not cloud_device:
-                raise HTTPException(status_code=503, detail="Cloud device not available")
+            logger.info("Executing command '%s' for device '%s' (attempt %s)", command, device_name, attempt + 1)
             
             # Validate MQTT connection
-            if not await validate_mqtt_connection(device):
+            if not await validate_mqtt_connection(cloud_device, cloud_client):
                 raise HTTPException(status_code=503, detail="Device connection not ready")
             
-            # Set up device communication if this is the first command
-            # Check if we need to set up device communication by looking for a session
-            communication_setup_done = False
-            for session in session_manager.sessions.values():
-                if session.get("device_name") == device_name:
-                    communication_setup_done = session.get("communication_setup_done", False)
-                    break
-            
-            if not communication_setup_done:
-                logger.info(f"Setting up device communication for first command: {device_name}")
-                if await setup_device_communication(device):
-                    # Mark communication setup as done in the session
-                    for session in session_manager.sessions.values():
-                        if session.get("device_name") == device_name:
-                            session["communication_setup_done"] = True
-                            break
+            # Set up device communication if this is the first command for this cloud device
+            if cloud_device not in _setup_done:
+                logger.info("Setting up device communication for first command: %s", device_name)
+                if await setup_device_communication(device_name, cloud_device, budget):
                     logger.info("Device communication setup completed")
                 else:
                     logger.warning("Device communication setup failed, but continuing with command")
             
             # Execute command using the cloud device directly (following test file pattern)
-            if command == "start_mowing":
-                result = await cloud_device.queue_command("start_job")
-            elif command == "stop_mowing":
-                result = await cloud_device.queue_command("cancel_job")
-            elif command == "pause_mowing":
-                result = await cloud_device.queue_command("pause_execute_task")
-            elif command == "resume_mowing":
-                result = await cloud_device.queue_command("resume_execute_task")
-            elif command == "return_to_dock":
-                result = await cloud_device.queue_command("return_to_dock")
-            else:
-                raise HTTPException(status_code=400, detail=f"Unknown command: {command}")
+            result = await cloud_device.queue_command(device_command, **command_kwargs)
             
+            # The command changes device state, so drop the cached status snapshot
+            _status_cache.pop(device_name, None)
             return result
             
         except SetupException as e:
             error_code, iot_id = e.args
-            logger.warning(f"SetupException occurred (code: {error_code}, iot_id: {iot_id})")
+            _session_valid_cache.clear()
+            logger.warning("SetupException occurred (code: %s, iot_id: %s)", error_code, iot_id)
             
             if error_code == 29003:  # identityId is blank - need to re-establish cloud session
                 logger.info("Error 29003 detected - identityId is blank. Re-establishing cloud session...")
                 
-                if attempt < max_retries:
+                if attempt < max_retries and not budget.exhausted:
                     try:
-                        # Get the device to find the account
-                        device = mammotion.get_device_by_name(device_name)
-                        if device and hasattr(device, 'cloud_client') and device.cloud_client:
+                        if cloud_client:
                             # Get the account from the session
-                            user_account = None
-                            for session in session_manager.sessions.values():
-                                if session.get("device_name") == device_name:
-                                    user_account = session.get("account")
-                                    break
+                            session = session_manager.get_by_device(device_name)
+                            user_account = session.account if session else None
                             
                             if user_account:
-                                logger.info(f"Re-establishing cloud session for account: {user_account}")
+                                logger.info("Re-establishing cloud session for account: %s", user_account)
                                 
                                 # Re-establish the entire cloud session
-                                await re_establish_cloud_session(mammotion, device, user_account)
+                                await re_establish_cloud_session(cloud_client, device_name, user_account, budget)
                                 
                                 # Re-setup device communication
-                                if await setup_device_communication(device):
-                                    # Mark communication setup as done in the session
-                                    for session in session_manager.sessions.values():
-                                        if session.get("device_name") == device_name:
-                                            session["communication_setup_done"] = True
-                                            break
+                                _setup_done.discard(cloud_device)
+                                if await setup_device_communication(device_name, cloud_device, budget):
                                     logger.info("Cloud session re-established and device setup successful, retrying command...")
                                     continue
                                 else:
@@ -418,70 +618,113 @@ async def handle_command_with_retry(mammotion: Mammotion, device_name: str, comm
                         else:
                             logger.error("Device or cloud client not available for session re-establishment")
                     except Exception as refresh_error:
-                        logger.error(f"Failed to re-establish cloud session: {refresh_error}")
-                        logger.error(f"Traceback: {traceback.format_exc()}")
+                        logger.exception("Failed to re-establish cloud session: %s", refresh_error)
                 
                 # If we get here, either no more retries or refresh failed
-                logger.error(f"Command failed after {attempt + 1} attempts due to identityId issue")
+                logger.error("Command failed after %s attempts due to identityId issue", attempt + 1)
                 raise HTTPException(
                     status_code=401, 
                     detail="Authentication failed - identityId is blank. Please try logging in again."
                 )
             else:
                 # Handle other SetupException codes
-                if attempt < max_retries:
+                if attempt < max_retries and not budget.exhausted:
                     logger.info("Attempting to refresh session and re-establish connection...")
                     try:
-                        # Get the device to find the account
-                        device = mammotion.get_device_by_name(device_name)
-                        if device and hasattr(device, 'cloud_client') and device.cloud_client:
+                        if cloud_client:
                             # Try to refresh the login
-                            http_response = device.cloud_client.mammotion_http.response
+                            http_response = cloud_client.mammotion_http.response
                             if http_response and hasattr(http_response, 'data') and http_response.data:
                                 user_account = http_response.data.get("userInformation", {}).get("userAccount", "")
                                 if user_account:
                                     await mammotion.refresh_login(user_account)
                                     
                                     # Re-setup device communication
-                                    if await setup_device_communication(device):
-                                        # Mark communication setup as done in the session
-                                        for session in session_manager.sessions.values():
-                                            if session.get("device_name") == device_name:
-                                                session["communication_setup_done"] = True
-                                                break
+                                    _setup_done.discard(cloud_device)
+                                    if await setup_device_communication(device_name, cloud_device, budget):
                                         logger.info("Session refresh and device setup successful, retrying command...")
                                         continue
                     except Exception as refresh_error:
-                        logger.error(f"Failed to refresh session: {refresh_error}")
+                        logger.error("Failed to refresh session: %s", refresh_error)
                 
                 # If we get here, either no more retries or refresh failed
-                logger.error(f"Command failed after {attempt + 1} attempts")
+                logger.error("Command failed after %s attempts", attempt + 1)
                 raise HTTPException(
                     status_code=401, 
                     detail=f"Authentication failed (code: {error_code}). Please try logging in again."
                 )
             
         except Exception as e:
-            logger.error(f"Unexpected error executing command '{command}': {str(e)}")
+            logger.error("Unexpected error executing command '%s': %s", command, e)
             raise HTTPException(status_code=500, detail=f"Command failed: {str(e)}")
 
-async def re_establish_cloud_session(mammotion: Mammotion, device, user_account: str) -> bool:
+async def _run_cloud_handshake(
+    cloud_client: CloudIOTGateway,
+    country_code: str,
+    budget: Optional[RetryBudget] = None
+) -> None:
+    """
+    Run the IoT auth chain after a successful HTTP login.
+    
+    Each step depends on the previous one, so they run in order, each with
+    retries.
+    
+    Args:
+        cloud_client: The cloud client to authenticate
+        country_code: Country code from the HTTP login info
+        budget: Optional retry budget shared with the caller
+    """
+    await exponential_backoff(cloud_client.get_region, country_code, max_retries=3, budget=budget)
+    await exponential_backoff(cloud_client.connect, max_retries=3, budget=budget)
+    await exponential_backoff(cloud_client.login_by_oauth, country_code, max_retries=3, budget=budget)
+    await exponential_backoff(cloud_client.aep_handle, max_retries=3, budget=budget)
+    await exponential_backoff(cloud_client.session_by_auth_code, max_retries=3, budget=budget)
+
+def _assert_identity_id(cloud_client: CloudIOTGateway) -> str:
+    """
+    Check that the cloud session carries an identityId.
+    
+    Args:
+        cloud_client: The authenticated cloud client
+        
+    Returns:
+        The session's identityId
+        
+    Raises:
+        HTTPException: If the session response or its identityId is missing
+    """
+    session_response = cloud_client.session_by_authcode_response
+    if not session_response or not session_response.data:
+        raise HTTPException(status_code=401, detail="Login failed: No session response received")
+    
+    if not session_response.data.identityId:
+        logger.error("Login failed: identityId is missing from session response")
+        logger.error("Session response: %s", session_response)
+        raise HTTPException(status_code=401, detail="Login failed: identityId is missing from session response")
+    
+    return session_response.data.identityId
+
+async def re_establish_cloud_session(
+    cloud_client: CloudIOTGateway,
+    device_name: str,
+    user_account: str,
+    budget: Optional[RetryBudget] = None
+) -> bool:
     """
     Re-establish the cloud session for a device when identityId is blank.
     
     Args:
-        mammotion: Mammotion instance
-        device: The device to re-establish session for
+        cloud_client: The device's cloud client
+        device_name: Name of the device to re-establish session for
         user_account: The user account
+        budget: Retry budget shared with the rest of the command's recovery
         
     Returns:
         True if successful, False otherwise
     """
     try:
-        logger.info(f"Re-establishing cloud session for device {device.name}")
+        logger.info("Re-establishing cloud session for device %s", device_name)
         
-        # Get the cloud client from the device
-        cloud_client = device.cloud_client
         if not cloud_client:
             logger.error("No cloud client available")
             return False
@@ -494,92 +737,72 @@ async def re_establish_cloud_session(mammotion: Mammotion, device, user_account:
         
         # Get the password from the session
         password = None
-        for session in session_manager.sessions.values():
-            if session.get("device_name") == device.name and session.get("account") == user_account:
-                password = session.get("password")
-                break
+        session = session_manager.get_by_account_device(user_account, device_name)
+        if session is not None:
+            password = session_manager.get_password(session)
         
         if not password:
             logger.error("No password available for re-authentication")
             return False
         
         # Re-establish the cloud session by re-running the login flow
-        await exponential_backoff(
-            lambda: mammotion_http.login(user_account, password),
-            max_retries=3,
-            initial_delay=2.0
-        )
+        await exponential_backoff(mammotion_http.login, user_account, password, max_retries=3, budget=budget)
         
         if not mammotion_http.login_info:
             logger.error("Re-login failed: No login info received")
             return False
         
         country_code = mammotion_http.login_info.userInformation.domainAbbreviation
-        logger.debug(f"Re-login successful, CountryCode: {country_code}")
+        logger.debug("Re-login successful, CountryCode: %s", country_code)
         
         # Re-establish cloud connection
-        await exponential_backoff(
-            lambda: cloud_client.get_region(country_code),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.connect(),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.login_by_oauth(country_code),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.aep_handle(),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.session_by_auth_code(),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
+        await _run_cloud_handshake(cloud_client, country_code, budget)
         
         # Verify that identityId is now populated
-        if (cloud_client.session_by_authcode_response and 
-            cloud_client.session_by_authcode_response.data and 
-            cloud_client.session_by_authcode_response.data.identityId):
-            logger.info(f"Cloud session re-established successfully with valid identityId: {cloud_client.session_by_authcode_response.data.identityId}")
-            return True
-        else:
+        try:
+            identity_id = _assert_identity_id(cloud_client)
+        except HTTPException:
             logger.error("Cloud session re-established but identityId is still blank")
-            if cloud_client.session_by_authcode_response:
-                logger.error(f"Session response: {cloud_client.session_by_authcode_response}")
             return False
+        logger.info("Cloud session re-established successfully with valid identityId: %s", identity_id)
+        return True
             
     except Exception as e:
-        logger.error(f"Failed to re-establish cloud session: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Failed to re-establish cloud session: %s", e)
         return False
+    finally:
+        # The session changed (or broke), so the cached validity no longer applies
+        if cloud_client:
+            _session_valid_cache.pop(id(cloud_client), None)
+
+# Cloud session validity per cloud client: id(cloud_client) -> (monotonic timestamp, valid)
+_session_valid_cache: Dict[int, Tuple[float, bool]] = {}
 
 def is_cloud_session_valid(cloud_client) -> bool:
     """
     Check if the cloud session has a valid identityId.
     
+    The result is reused for SESSION_VALID_TTL seconds per cloud client;
+    re-authentication and SetupExceptions drop the cached entry.
+    
     Args:
         cloud_client: The cloud client to check
         
     Returns:
         True if session is valid, False otherwise
     """
+    if not cloud_client:
+        return False
+    key = id(cloud_client)
+    cached = _session_valid_cache.get(key)
+    if cached and time.monotonic() - cached[0] < SESSION_VALID_TTL:
+        return cached[1]
+    valid = _check_cloud_session(cloud_client)
+    _session_valid_cache[key] = (time.monotonic(), valid)
+    return valid
+
+def _check_cloud_session(cloud_client) -> bool:
+    """Check the cloud client's session fields without caching."""
     try:
         if not cloud_client or not cloud_client.session_by_authcode_response:
             return False
@@ -590,7 +813,7 @@ def is_cloud_session_valid(cloud_client) -> bool:
         
         # Check if identityId is present and not empty
         if not session_data.identityId or session_data.identityId.strip() == "":
-            logger.debug(f"identityId is blank or empty: '{session_data.identityId}'")
+            logger.debug("identityId is blank or empty: '%s'", session_data.identityId)
             return False
         
         # Check if other required fields are present
@@ -598,17 +821,164 @@ def is_cloud_session_valid(cloud_client) -> bool:
             logger.debug("Missing required tokens in session")
             return False
         
-        logger.debug(f"Cloud session is valid with identityId: {session_data.identityId}")
+        logger.debug("Cloud session is valid with identityId: %s", session_data.identityId)
         return True
         
     except Exception as e:
-        logger.error(f"Error checking cloud session validity: {str(e)}")
+        logger.error("Error checking cloud session validity: %s", e)
         return False
 
+# Per-device command queues, each drained by a single dispatcher task
+_cmd_queues: Dict[str, asyncio.Queue] = {}
+_cmd_dispatchers: Dict[str, asyncio.Task] = {}
+# The newest queued, not yet dispatched (command, future) per device. A repeat of that
+# command joins it; anything older is never joined, since a later command could undo it.
+_last_queued: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+async def _drain_commands(mammotion: Mammotion, device_name: str, queue: asyncio.Queue) -> None:
+    """
+    Send a device's queued commands one at a time, in submission order.
+    
+    Each entry already carries every caller that submit_command coalesced
+    into it, so it costs one cloud call however many callers share it.
+    Exits and removes its queue after COMMAND_IDLE_TIMEOUT without commands.
+    """
+    while True:
+        try:
+            entry = await asyncio.wait_for(queue.get(), COMMAND_IDLE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if not queue.empty():
+                continue
+            # Idle, so release the queue and this task; the next command starts a fresh dispatcher
+            if _cmd_queues.get(device_name) is queue:
+                del _cmd_queues[device_name]
+            if _cmd_dispatchers.get(device_name) is asyncio.current_task():
+                del _cmd_dispatchers[device_name]
+            return
+        command, future = entry
+        if _last_queued.get(device_name) is entry:
+            # Dispatched now, so later submissions must queue a fresh send
+            del _last_queued[device_name]
+        if future.cancelled():
+            continue
+        try:
+            result = await handle_command_with_retry(mammotion, device_name, command)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            if not future.cancelled():
+                future.set_exception(e)
+        else:
+            if not future.cancelled():
+                future.set_result(result)
+
+async def stop_command_dispatchers() -> None:
+    """Cancel the per-device dispatchers and the commands still waiting in their queues."""
+    dispatchers = list(_cmd_dispatchers.values())
+    for task in dispatchers:
+        task.cancel()
+    await asyncio.gather(*dispatchers, return_exceptions=True)
+    for queue in _cmd_queues.values():
+        while not queue.empty():
+            _, future = queue.get_nowait()
+            future.cancel()
+    _cmd_dispatchers.clear()
+    _cmd_queues.clear()
+    _last_queued.clear()
+
+async def submit_command(mammotion: Mammotion, device_name: str, command: str) -> Any:
+    """
+    Queue a command for a device and wait for its result.
+    
+    A caller submitting the same command as the last one queued for the
+    device, while that one is still waiting to be sent, shares its send.
+    Start, start collapses to one send; start, stop, start sends all three.
+    
+    Args:
+        mammotion: Mammotion instance
+        device_name: Name of the device
+        command: Command name as accepted by handle_command_with_retry
+    
+    Returns:
+        Result of the command
+    
+    Raises:
+        HTTPException: If the device is unknown
+    """
+    # Checked before any per-device state is created, so unknown names cost nothing
+    if not mammotion.device_manager.has_device(device_name):
+        raise HTTPException(status_code=404, detail=f"Device '{device_name}' not found")
+    
+    last = _last_queued.get(device_name)
+    if last is not None and last[0] == command:
+        return await asyncio.shield(last[1])
+    
+    queue = _cmd_queues.get(device_name)
+    if queue is None:
+        queue = _cmd_queues[device_name] = asyncio.Queue()
+    dispatcher = _cmd_dispatchers.get(device_name)
+    if dispatcher is None or dispatcher.done():
+        _cmd_dispatchers[device_name] = asyncio.create_task(_drain_commands(mammotion, device_name, queue))
+    
+    future = asyncio.get_running_loop().create_future()
+    entry = (command, future)
+    _last_queued[device_name] = entry
+    queue.put_nowait(entry)
+    # Shielded so one caller disconnecting does not cancel the shared command
+    return await asyncio.shield(future)
+
+def _provision_device(
+    device,
+    mammotion: Mammotion,
+    cloud_client: CloudIOTGateway,
+    mammotion_mqtt: MammotionCloud
+) -> Tuple[MammotionMixedDeviceManager, bool]:
+    """
+    Create a device manager for a cloud device, or attach the new MQTT client to an existing one.
+    
+    Args:
+        device: Device entry from the account's device list
+        mammotion: Mammotion instance
+        cloud_client: Logged-in cloud client
+        mammotion_mqtt: MQTT client for the account
+        
+    Returns:
+        The device manager and whether it was newly created
+    """
+    mixed_device = mammotion.device_manager.devices.get(device.deviceName)
+    if mixed_device is not None:
+        # Update existing device with new cloud connection
+        if mixed_device.cloud() is None:
+            mixed_device.add_cloud(mqtt=mammotion_mqtt)
+        else:
+            mixed_device.replace_mqtt(mammotion_mqtt)
+        return mixed_device, False
+    
+    # Create new device
+    mixed_device = MammotionMixedDeviceManager(
+        name=device.deviceName,
+        iot_id=device.iotId,
+        cloud_client=cloud_client,
+        mammotion_http=cloud_client.mammotion_http,
+        cloud_device=device,
+        mqtt=mammotion_mqtt,
+        preference=ConnectionPreference.WIFI,
+    )
+    mixed_device.mower_state.mower_state.product_key = device.productKey
+    mixed_device.mower_state.mower_state.model = (
+        device.productName if device.productModel is None else device.productModel
+    )
+    
+    # Disable automatic sync by setting device as stopped initially
+    cloud_device = mixed_device.cloud()
+    if cloud_device is not None:
+        cloud_device.stopped = True
+    return mixed_device, True
+
 @app.post("/login", response_model=LoginResponse)
 async def login(
-    request: LoginRequest,
-    mammotion: Mammotion = Depends(get_mammotion_instance)
+    request: LoginRequest
 ):
     """
     Login to Mammotion cloud and initialize device connection.
@@ -616,109 +986,58 @@ async def login(
     This endpoint follows the test script pattern for reliable login and MQTT connection,
     then stores devices in the global Mammotion instance for centralized access.
     """
+    mammotion = session_manager.mammotion
     try:
-        logger.info(f"Login attempt for account: {request.account}")
+        logger.info("Login attempt for account: %s", request.account)
         
         # Step 1: Create HTTP client and login
         mammotion_http = MammotionHTTP()
         cloud_client = CloudIOTGateway(mammotion_http)
         
-        # Add initial delay to avoid rate limiting
-        await asyncio.sleep(1.0)
-        
         # Login with retry logic
-        await exponential_backoff(
-            lambda: mammotion_http.login(request.account, request.password),
-            max_retries=3,
-            initial_delay=2.0
-        )
+        await exponential_backoff(mammotion_http.login, request.account, request.password, max_retries=3)
         
         if not mammotion_http.login_info:
             raise HTTPException(status_code=401, detail="Login failed: No login info received")
         
         country_code = mammotion_http.login_info.userInformation.domainAbbreviation
-        logger.debug(f"CountryCode: {country_code}")
-        logger.debug(f"AuthCode: {mammotion_http.login_info.authorization_code}")
-        
-        # Step 2: Execute API calls sequentially with delays and retries
-        await exponential_backoff(
-            lambda: cloud_client.get_region(country_code),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.connect(),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.login_by_oauth(country_code),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.aep_handle(),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
-        
-        await exponential_backoff(
-            lambda: cloud_client.session_by_auth_code(),
-            max_retries=3,
-            initial_delay=2.0
-        )
-        await asyncio.sleep(0.5)
+        logger.debug("CountryCode: %s", country_code)
+        logger.debug("AuthCode: %s", mammotion_http.login_info.authorization_code)
         
-        await exponential_backoff(
-            lambda: mammotion_http.get_all_error_codes(),
-            max_retries=3,
-            initial_delay=2.0
+        # Error codes are independent of the IoT auth chain, so fetch them meanwhile
+        error_codes_task = asyncio.create_task(
+            exponential_backoff(mammotion_http.get_all_error_codes, max_retries=3)
         )
+        try:
+            # Step 2: Execute the IoT auth chain
+            await _run_cloud_handshake(cloud_client, country_code)
+            
+            # Step 3: Get device binding information
+            _, binding_result = await asyncio.gather(
+                error_codes_task,
+                cloud_client.list_binding_by_account()
+            )
+        finally:
+            if not error_codes_task.done():
+                error_codes_task.cancel()
         
-        # Step 3: Get device binding information
-        binding_result = await cloud_client.list_binding_by_account()
-        logger.debug(f"list_binding_by_account result: {binding_result}")
+        logger.debug("list_binding_by_account result: %s", binding_result)
         
         # Step 4: Validate required responses
-        required_fields = [
-            ('region_response', 'data.regionId'),
-            ('aep_response', 'data.productKey'),
-            ('aep_response', 'data.deviceName'),
-            ('aep_response', 'data.deviceSecret'),
-            ('session_by_authcode_response', 'data.iotToken')
-        ]
-        
-        missing_fields = []
-        for field, attr in required_fields:
-            try:
-                obj = getattr(cloud_client, field)
-                parts = attr.split('.')
-                for part in parts:
-                    obj = getattr(obj, part)
-            except Exception:
-                missing_fields.append(f"{field}.{attr}")
-        
-        if missing_fields:
-            raise ValueError(f"Missing required fields in cloud client responses: {', '.join(missing_fields)}")
+        try:
+            (
+                cloud_client.region_response.data.regionId,
+                cloud_client.aep_response.data.productKey,
+                cloud_client.aep_response.data.deviceName,
+                cloud_client.aep_response.data.deviceSecret,
+                cloud_client.session_by_authcode_response.data.iotToken
+            )
+        except AttributeError as e:
+            raise ValueError(f"Missing required field in cloud client responses: {e}")
         
         # Step 5: Create MQTT client manually (following test script pattern)
-        if not cloud_client.session_by_authcode_response or not cloud_client.session_by_authcode_response.data:
-            raise HTTPException(status_code=401, detail="Login failed: No session response received")
-        
-        # Verify that identityId is present
-        if not cloud_client.session_by_authcode_response.data.identityId:
-            logger.error("Login failed: identityId is missing from session response")
-            logger.error(f"Session response: {cloud_client.session_by_authcode_response}")
-            raise HTTPException(status_code=401, detail="Login failed: identityId is missing from session response")
-        
-        logger.info(f"Login successful with identityId: {cloud_client.session_by_authcode_response.data.identityId}")
+        identity_id = _assert_identity_id(cloud_client)
+        logger.info("Login successful with identityId: %s", identity_id)
         
         mammotion_mqtt = MammotionCloud(MammotionMQTT(
             region_id=cloud_client.region_response.data.regionId,
@@ -734,7 +1053,7 @@ async def login(
         try:
             mammotion_mqtt.connect_async()
         except Exception as e:
-            logger.error(f"MQTT connection failed: {str(e)}")
+            logger.error("MQTT connection failed: %s", e)
             raise
         
         # Step 7: Store MQTT client in global Mammotion instance
@@ -744,57 +1063,29 @@ async def login(
         if not cloud_client.devices_by_account_response or not cloud_client.devices_by_account_response.data:
             raise HTTPException(status_code=404, detail="No devices found for this account")
         
+        mower_devices = [
+            device for device in cloud_client.devices_by_account_response.data.data
+            if device.deviceName.startswith(MOWER_PREFIXES)
+        ]
         devices_created = []
-        for device in cloud_client.devices_by_account_response.data.data:
-            if device.deviceName.startswith(("Luba-", "Yuka-")):
-                # Create device using the global Mammotion instance's device manager
-                mixed_device = mammotion.device_manager.get_device(device.deviceName)
-                if mixed_device is None:
-                    # Create new device
-                    from pymammotion.mammotion.devices.mammotion import MammotionMixedDeviceManager
-                    mixed_device = MammotionMixedDeviceManager(
-                        name=device.deviceName,
-                        iot_id=device.iotId,
-                        cloud_client=cloud_client,
-                        mammotion_http=cloud_client.mammotion_http,
-                        cloud_device=device,
-                        mqtt=mammotion_mqtt,
-                        preference=ConnectionPreference.WIFI,
-                    )
-                    mixed_device.mower_state.mower_state.product_key = device.productKey
-                    mixed_device.mower_state.mower_state.model = (
-                        device.productName if device.productModel is None else device.productModel
-                    )
-                    
-                    # Disable automatic sync by setting device as stopped initially
-                    if hasattr(mixed_device, 'cloud'):
-                        cloud_device = mixed_device.cloud()
-                        if cloud_device:
-                            # Set device as stopped to prevent automatic sync
-                            cloud_device.stopped = True
-                    
-                    mammotion.device_manager.add_device(mixed_device)
-                    devices_created.append(mixed_device)
-                else:
-                    # Update existing device with new cloud connection
-                    if mixed_device.cloud() is None:
-                        mixed_device.add_cloud(mqtt=mammotion_mqtt)
-                    else:
-                        mixed_device.replace_mqtt(mammotion_mqtt)
-                    devices_created.append(mixed_device)
+        for device in mower_devices:
+            mixed_device, created = _provision_device(device, mammotion, cloud_client, mammotion_mqtt)
+            if created:
+                mammotion.device_manager.add_device(mixed_device)
+            devices_created.append(mixed_device)
+        
+        # Cloud connections were added or replaced, so cached lookups and the /devices listing are stale
+        bump_device_generation()
         
         if not devices_created:
             raise HTTPException(status_code=404, detail="No compatible devices found for this account")
         
         # Step 9: Select target device
-        target_device = None
         if request.device_name:
             # Find specific device
-            for dev in devices_created:
-                if dev.name == request.device_name:
-                    target_device = dev
-                    break
-            if not target_device:
+            created_by_name = {dev.name: dev for dev in devices_created}
+            target_device = created_by_name.get(request.device_name)
+            if target_device is None:
                 raise HTTPException(
                     status_code=404, 
                     detail=f"Device '{request.device_name}' not found"
@@ -808,11 +1099,8 @@ async def login(
         device_name = request.device_name
         session_id = session_manager.create_session(request.account, device_name, request.password)
         
-        # Store session reference for communication setup tracking
-        session_manager.sessions[session_id]["communication_setup"] = False
-        
-        logger.info(f"Login successful for account: {request.account}, device: {device_name}")
-        logger.info(f"Created {len(devices_created)} devices in global Mammotion instance")
+        logger.info("Login successful for account: %s, device: %s", request.account, device_name)
+        logger.info("Created %s devices in global Mammotion instance", len(devices_created))
         
         return LoginResponse(
             success=True,
@@ -822,239 +1110,223 @@ async def login(
         )
         
     except Exception as e:
-        logger.error(f"Login failed for account {request.account}: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Login failed for account %s: %s", request.account, e)
         raise HTTPException(status_code=401, detail=f"Login failed: {str(e)}")
 
+def _build_status(mammotion: Mammotion, device_name: str) -> MowerStatus:
+    """
+    Build the status of a mower device from its cached state.
+    
+    Repeated calls within STATUS_CACHE_TTL return the last snapshot.
+    
+    Args:
+        mammotion: Mammotion instance
+        device_name: Name of the device
+    
+    Returns:
+        Current MowerStatus of the device
+    """
+    cached = _status_cache.get(device_name)
+    if cached and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+        return cached[1]
+    
+    # Get device from global Mammotion instance
+    device = resolve_device(device_name)
+    if not device:
+        raise HTTPException(status_code=404, detail=f"Device '{device_name}' not found")
+    
+    # Get mower state
+    mower_state = device.mower_state
+    
+    # Report data from an offline mower is stale, so skip reading it and leave the readings unset
+    if not mower_state.online:
+        status = MowerStatus(
+            device_name=device_name,
+            online=False,
+            work_mode="offline",
+            last_updated=coarse_now()
+        )
+        _status_cache[device_name] = (time.monotonic(), status)
+        return status
+    
+    # Get work mode string
+    work_mode_code = mower_state.report_data.dev.sys_status
+    work_mode = work_mode_name(work_mode_code)
+    
+    # Get location info
+    location = mower_state.location
+    position = location.device
+    
+    # Built from internal device state, so skip validation
+    status = MowerStatus.model_construct(
+        device_name=device_name,
+        online=mower_state.online,
+        work_mode=work_mode,
+        work_mode_code=work_mode_code,
+        battery_level=mower_state.report_data.dev.battery_val,
+        charging_state=mower_state.report_data.dev.charge_state,
+        blade_status=mower_state.mower_state.blade_status,
+        latitude=position.latitude if position else None,
+        longitude=position.longitude if position else None,
+        position_type=location.position_type if position else None,
+        orientation=location.orientation if position else None,
+        work_progress=mower_state.report_data.work.progress,
+        work_area=mower_state.report_data.work.area,
+        last_updated=coarse_now()
+    )
+    _status_cache[device_name] = (time.monotonic(), status)
+    return status
+
 @app.get("/status", response_model=MowerStatus)
 async def get_mower_status(
-    device_name: str,
-    mammotion: Mammotion = Depends(get_mammotion_instance)
+    device_name: str
 ):
     """
     Get the current status of a mower device.
     
     Returns detailed information about the mower's current state,
     including work mode, battery level, and location.
+    Repeated polls within STATUS_CACHE_TTL are served from the last snapshot.
     """
     try:
-        # Get device from global Mammotion instance
-        device = mammotion.get_device_by_name(device_name)
-        if not device:
-            raise HTTPException(status_code=404, detail=f"Device '{device_name}' not found")
-        
-        # Get mower state
-        mower_state = device.mower_state
-        
-        # Get work mode string
-        work_mode_code = mower_state.report_data.dev.sys_status
-        work_mode = device_mode(work_mode_code)
-        
-        # Get location info
-        location = None
-        if mower_state.location.device:
-            location = {
-                "latitude": mower_state.location.device.latitude,
-                "longitude": mower_state.location.device.longitude,
-                "position_type": mower_state.location.position_type,
-                "orientation": mower_state.location.orientation
-            }
-        
-        return MowerStatus(
-            device_name=device_name,
-            online=mower_state.online,
-            work_mode=work_mode,
-            work_mode_code=work_mode_code,
-            battery_level=mower_state.report_data.dev.battery_val,
-            charging_state=mower_state.report_data.dev.charge_state,
-            blade_status=mower_state.mower_state.blade_status,
-            location=location,
-            work_progress=mower_state.report_data.work.progress,
-            work_area=mower_state.report_data.work.area,
-            last_updated=datetime.now()
-        )
+        return _build_status(session_manager.mammotion, device_name)
         
     except Exception as e:
-        logger.error(f"Failed to get status for device {device_name}: {str(e)}")
+        logger.error("Failed to get status for device %s: %s", device_name, e)
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
-@app.post("/start-mow", response_model=CommandResponse)
-async def start_mowing(
-    request: CommandRequest,
-    mammotion: Mammotion = Depends(get_mammotion_instance)
+@app.post("/status/batch", response_model=StatusBatchResponse)
+async def get_mower_status_batch(
+    request: StatusBatchRequest
 ):
     """
-    Start mowing operation.
+    Get the current status of several mower devices in one call.
     
-    Sends a command to the mower to begin its mowing task.
+    Devices whose status cannot be read are reported in ``errors``
+    instead of failing the whole request.
     """
-    try:
-        logger.info(f"Starting mowing for device: {request.device_name}")
-        
-        # Use handle_command_with_retry for proper setup and error handling
-        result = await handle_command_with_retry(mammotion, request.device_name, "start_mowing")
-        
-        return CommandResponse(
-            success=True,
-            message="Mowing started successfully",
-            command_sent="start_job"
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
-    except Exception as e:
-        logger.error(f"Failed to start mowing for device {request.device_name}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to start mowing: {str(e)}")
-
-@app.post("/stop-mow", response_model=CommandResponse)
-async def stop_mowing(
-    request: CommandRequest,
-    mammotion: Mammotion = Depends(get_mammotion_instance)
-):
-    """
-    Stop mowing operation.
+    mammotion = session_manager.mammotion
+    statuses = []
+    errors = {}
+    for device_name in request.device_names:
+        try:
+            statuses.append(_build_status(mammotion, device_name))
+        except Exception as e:
+            logger.error("Failed to get status for device %s: %s", device_name, e)
+            errors[device_name] = str(e)
     
-    Sends a command to the mower to stop its current mowing task.
-    """
-    try:
-        logger.info(f"Stopping mowing for device: {request.device_name}")
-        
-        # Use handle_command_with_retry for proper setup and error handling
-        result = await handle_command_with_retry(mammotion, request.device_name, "stop_mowing")
-        
-        return CommandResponse(
-            success=True,
-            message="Mowing stopped successfully",
-            command_sent="cancel_job"
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
-    except Exception as e:
-        logger.error(f"Failed to stop mowing for device {request.device_name}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to stop mowing: {str(e)}")
+    return StatusBatchResponse.model_construct(statuses=statuses, errors=errors)
 
-@app.post("/return-to-dock", response_model=CommandResponse)
-async def return_to_dock(
-    request: CommandRequest,
-    mammotion: Mammotion = Depends(get_mammotion_instance)
-):
-    """
-    Send mower back to charging dock.
-    
-    Commands the mower to return to its charging station.
-    """
-    try:
-        logger.info(f"Sending device {request.device_name} to dock")
-        
-        # Use handle_command_with_retry for proper setup and error handling
-        result = await handle_command_with_retry(mammotion, request.device_name, "return_to_dock")
-        
-        return CommandResponse(
-            success=True,
-            message="Mower returning to dock",
-            command_sent="return_to_dock"
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
-    except Exception as e:
-        logger.error(f"Failed to send device {request.device_name} to dock: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to return to dock: {str(e)}")
+# Legacy command endpoints: path -> (endpoint name, command, command sent, success message, docstring)
+_COMMAND_ROUTES = {
+    "/start-mow": (
+        "start_mowing", "start_mowing", "start_job", "Mowing started successfully",
+        "Start mowing operation.\n\nSends a command to the mower to begin its mowing task."
+    ),
+    "/stop-mow": (
+        "stop_mowing", "stop_mowing", "cancel_job", "Mowing stopped successfully",
+        "Stop mowing operation.\n\nSends a command to the mower to stop its current mowing task."
+    ),
+    "/return-to-dock": (
+        "return_to_dock", "return_to_dock", "return_to_dock", "Mower returning to dock",
+        "Send mower back to charging dock.\n\nCommands the mower to return to its charging station."
+    ),
+    "/pause-mowing": (
+        "pause_mowing", "pause_mowing", "pause_execute_task", "Mowing paused successfully",
+        "Pause the current mowing operation.\n\nTemporarily pauses the mower's current task."
+    ),
+    "/resume-mowing": (
+        "resume_mowing", "resume_mowing", "resume_execute_task", "Mowing resumed successfully",
+        "Resume a paused mowing operation.\n\nResumes the mower's previously paused task."
+    ),
+}
 
-@app.post("/pause-mowing", response_model=CommandResponse)
-async def pause_mowing(
-    request: CommandRequest,
-    mammotion: Mammotion = Depends(get_mammotion_instance)
-):
+def _make_command_handler(name: str, command: str, command_sent: str, message: str, doc: str):
     """
-    Pause the current mowing operation.
+    Build the endpoint for one legacy command route.
+    
+    Args:
+        name: Endpoint function name, used for the OpenAPI operation
+        command: Command name as accepted by handle_command_with_retry
+        command_sent: Device command reported back to the caller
+        message: Success message
+        doc: Endpoint docstring, used for the OpenAPI description
     
-    Temporarily pauses the mower's current task.
+    Returns:
+        Endpoint coroutine function
     """
-    try:
-        logger.info(f"Pausing mowing for device: {request.device_name}")
-        
-        # Use handle_command_with_retry for proper setup and error handling
-        result = await handle_command_with_retry(mammotion, request.device_name, "pause_mowing")
-        
-        return CommandResponse(
-            success=True,
-            message="Mowing paused successfully",
-            command_sent="pause_execute_task"
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
-    except Exception as e:
-        logger.error(f"Failed to pause mowing for device {request.device_name}: {str(e)}")
-        logger.error(f"Exception type: {type(e).__name__}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=f"Failed to pause mowing: {str(e)}")
+    action = command.replace("_", " ")
+    
+    async def handler(
+        request: CommandRequest
+    ):
+        try:
+            logger.info("Sending %s to device: %s", command, request.device_name)
+            
+            # Queue through the device dispatcher, which retries and handles setup
+            await submit_command(session_manager.mammotion, request.device_name, command)
+            
+            return CommandResponse.model_construct(
+                success=True,
+                message=message,
+                command_sent=command_sent
+            )
+            
+        except HTTPException:
+            # Re-raise HTTP exceptions as-is
+            raise
+        except Exception as e:
+            logger.error("Failed to %s for device %s: %s", action, request.device_name, e)
+            raise HTTPException(status_code=500, detail=f"Failed to {action}: {str(e)}")
+    
+    handler.__name__ = name
+    handler.__doc__ = doc
+    return handler
+
+# Handlers by command name, shared by the legacy routes and POST /command/{action}
+_COMMAND_HANDLERS = {}
+for _path, (_name, _command, _command_sent, _message, _doc) in _COMMAND_ROUTES.items():
+    _COMMAND_HANDLERS[_command] = _make_command_handler(_name, _command, _command_sent, _message, _doc)
+    app.post(_path, response_model=CommandResponse)(_COMMAND_HANDLERS[_command])
 
-@app.post("/resume-mowing", response_model=CommandResponse)
-async def resume_mowing(
-    request: CommandRequest,
-    mammotion: Mammotion = Depends(get_mammotion_instance)
+@app.post("/command/{action}", response_model=CommandResponse)
+async def send_command(
+    action: CommandAction,
+    request: CommandRequest
 ):
     """
-    Resume a paused mowing operation.
+    Send a command to the mower.
     
-    Resumes the mower's previously paused task.
+    Accepts any of the commands also exposed as individual routes
+    (/start-mow, /stop-mow, /return-to-dock, /pause-mowing, /resume-mowing).
     """
-    try:
-        logger.info(f"Resuming mowing for device: {request.device_name}")
-        
-        # Use handle_command_with_retry for proper setup and error handling
-        result = await handle_command_with_retry(mammotion, request.device_name, "resume_mowing")
-        
-        return CommandResponse(
-            success=True,
-            message="Mowing resumed successfully",
-            command_sent="resume_execute_task"
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
-    except Exception as e:
-        logger.error(f"Failed to resume mowing for device {request.device_name}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to resume mowing: {str(e)}")
+    return await _COMMAND_HANDLERS[action.value](request)
 
 @app.get("/devices")
 async def list_devices(
-    mammotion: Mammotion = Depends(get_mammotion_instance)
+    request: Request
 ):
     """
     List all available devices for the current session.
     
-    Returns a list of all mower devices that are available.
+    Returns a list of all mower devices that are available. Clients sending
+    ``Accept: application/x-ndjson`` get one JSON device object per line.
     """
     try:
-        devices = mammotion.device_manager.devices
-        
-        device_list = []
-        for device_name, device in devices.items():
-            device_info = {
-                "name": device_name,
-                "iot_id": device.iot_id,
-                "preference": str(device.preference),
-                "has_cloud": device.has_cloud(),
-                "has_ble": device.has_ble()
-            }
-            device_list.append(device_info)
-        
-        return {"devices": device_list}
+        devices, body = session_manager.get_devices_snapshot(_device_generation)
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                (orjson.dumps(device) + b"\n" for device in devices),
+                media_type="application/x-ndjson"
+            )
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Failed to list devices: {str(e)}")
+        logger.error("Failed to list devices: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to list devices: {str(e)}")
 
+_HEALTH_BODY_TEMPLATE = b'{"status":"healthy","timestamp":"%s","service":"Mammotion Mower Control API"}'
+
 @app.get("/health")
 async def health_check():
     """
@@ -1062,12 +1334,19 @@ async def health_check():
     
     Returns the current status of the API service.
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "service": "Mammotion Mower Control API"
-    }
+    return Response(content=_HEALTH_BODY_TEMPLATE % coarse_isoformat().encode(), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Sessions, device managers and MQTT connections live in each worker process,
+    # so running more than one worker needs clients pinned to a worker
+    workers = int(os.environ.get("MOWER_API_WORKERS", "1"))
+    uvicorn.run(
+        "main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        limit_concurrency=int(os.environ.get("MOWER_API_LIMIT_CONCURRENCY", "1024"))
+    ) 
\ No newline at end of file
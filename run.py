@@ -15,5 +15,9 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.RELOAD,
+        workers=settings.WORKERS,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=settings.LIMIT_CONCURRENCY,
         log_level=settings.LOG_LEVEL.lower()
     ) 
\ No newline at end of file
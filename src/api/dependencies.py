@@ -4,6 +4,7 @@ Shared dependencies for the API layer.
 This module contains common dependencies used across multiple API endpoints.
 """
 
+from functools import lru_cache
 from typing import Generator
 from fastapi import Depends, HTTPException, status
 from pymammotion.mammotion.devices.mammotion import Mammotion
@@ -11,25 +12,38 @@ from pymammotion.mammotion.devices.mammotion import Mammotion
 from src.services.mower.service import MowerService
 from src.services.cluster.service import ClusterService
 from src.core.session import SessionManager
+from src.core.database import get_db
+from src.services.user import UserService
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Service dependencies
+# Each is cached so every request shares one instance instead of building its own
+@lru_cache(maxsize=1)
 def get_mower_service() -> MowerService:
     """Get mower service instance."""
     return MowerService()
 
+@lru_cache(maxsize=1)
 def get_cluster_service() -> ClusterService:
     """Get cluster service instance."""
     return ClusterService()
 
+@lru_cache(maxsize=1)
 def get_session_manager() -> SessionManager:
     """Get session manager instance."""
     return SessionManager()
 
 # PyMammotion dependency
+@lru_cache(maxsize=1)
 def get_mammotion_instance() -> Mammotion:
     """Get PyMammotion instance for direct access when needed."""
     return Mammotion()
 
+# Request-scoped services; FastAPI reuses the result within a request
+def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
+    """Get a user service bound to the request's database session."""
+    return UserService(db)
+
 # Database dependencies (to be added when database is implemented)
 # def get_db() -> Generator:
 #     """Get database session."""
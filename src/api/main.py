@@ -5,16 +5,60 @@ This module contains the main FastAPI application setup and configuration.
 """
 
 import logging
+import uuid
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from src.core.config import settings
 from src.api.routes import mower, health, auth, devices, clusters, payments
+from src.api.dependencies import get_cluster_service, get_mammotion_instance, get_mower_service
+from src.core.database import get_async_session
+from src.services.user import UserService
     
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# (router, prefix, tag) for every route module, in registration order
+_ROUTERS = (
+    (health.router, "/health", "health"),
+    (auth.router, "/api/v1/auth", "auth"),
+    (devices.router, "/api/v1", "devices"),
+    (mower.router, "/api/v1/mowers", "mowers"),
+    (clusters.router, "/api/v1", "clusters"),
+    (payments.router, "", "payments"),
+)
+
+async def _warm_up_database() -> None:
+    """Run the hot auth queries once so their SQL is compiled and prepared before the first request."""
+    try:
+        async with get_async_session() as db:
+            user_service = UserService(db)
+            await user_service.get_by_email("")
+            await user_service.get_by_id(uuid.UUID(int=0))
+            await user_service.get_refresh_token("")
+            await user_service.get_primary_address(uuid.UUID(int=0))
+    except Exception as e:
+        logger.warning("Database warm-up failed: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the shared services before serving and release them on shutdown."""
+    logger.info("Starting MowthosOS API server...")
+    # Construct the cached singletons up front so the first request doesn't pay for it
+    get_mammotion_instance()
+    get_mower_service()
+    cluster_service = get_cluster_service()
+    # Generate the OpenAPI schema now; FastAPI caches it on the app for later /openapi.json requests
+    app.openapi()
+    await cluster_service.initialize()
+    await _warm_up_database()
+    yield
+    logger.info("Shutting down MowthosOS API server...")
+    await cluster_service.cleanup()
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     
@@ -24,6 +68,8 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs" if settings.DEBUG else None,
         redoc_url="/redoc" if settings.DEBUG else None,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
     
     # Add CORS middleware
@@ -36,22 +82,8 @@ def create_app() -> FastAPI:
     )
     
     # Include routers
-    app.include_router(health.router, prefix="/health", tags=["health"])
-    app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
-    app.include_router(devices.router, prefix="/api/v1", tags=["devices"])
-    app.include_router(mower.router, prefix="/api/v1/mowers", tags=["mowers"])
-    app.include_router(clusters.router, prefix="/api/v1", tags=["clusters"])
-    app.include_router(payments.router, tags=["payments"])
-    
-    @app.on_event("startup")
-    async def startup_event():
-        """Application startup event."""
-        logger.info("Starting MowthosOS API server...")
-        
-    @app.on_event("shutdown")
-    async def shutdown_event():
-        """Application shutdown event."""
-        logger.info("Shutting down MowthosOS API server...")
+    for router, prefix, tag in _ROUTERS:
+        app.include_router(router, prefix=prefix, tags=[tag])
     
     return app
 
@@ -1,15 +1,22 @@
 """
 Authentication API endpoints
 """
+import asyncio
 import logging
-from typing import Optional
-from datetime import datetime
+import re
+from typing import Annotated, Any, Awaitable, Callable, Optional, Tuple, TypeVar
+from uuid import UUID
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, Field, field_validator
 
-from src.core.database import get_db
+from src.core.database import get_db, get_async_session
+from src.core.password import verify_password_async
+from src.api.dependencies import get_user_service
 
 logger = logging.getLogger(__name__)
 from src.core.auth import (
@@ -19,36 +26,73 @@ from src.core.auth import (
     refresh_access_token,
     get_current_user,
     get_current_active_user,
+    forget_user_claims,
 )
 from src.services.user import UserService, InvalidCredentialsError, UserAlreadyExistsError, UserNotFoundError
 from src.models.database import User, UserRole, UserAddress
 from src.core.config import settings
 
 
-router = APIRouter(tags=["authentication"])
+router = APIRouter(tags=["authentication"], default_response_class=ORJSONResponse)
+
+# Settings are fixed for the life of the process, so read these once
+_PASSWORD_MIN_LENGTH = settings.PASSWORD_MIN_LENGTH
+_ACCESS_EXPIRES_IN = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_DELTA = settings.refresh_token_expire_timedelta
+_UTC = timezone.utc
+
+# ASCII bytes that are not digits / not uppercase, for deleting with bytes.translate
+_NON_DIGIT_ASCII = bytes(c for c in range(128) if not chr(c).isdigit())
+_NON_UPPER_ASCII = bytes(c for c in range(128) if not chr(c).isupper())
+# str.translate table dropping every ASCII character that is not a digit
+_DROP_NON_DIGITS = str.maketrans('', '', _NON_DIGIT_ASCII.decode('ascii'))
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _check_login_email(v: str) -> str:
+    """Cheap shape check for login emails; the account lookup rejects anything else"""
+    if not _EMAIL_RE.match(v):
+        raise ValueError('value is not a valid email address')
+    # Match EmailStr's normalization of stored addresses, which lowercases the domain
+    local, _, domain = v.rpartition('@')
+    return f"{local}@{domain.lower()}"
+
+
+# Used where the address only selects an existing account, instead of full email-validator checks
+LoginEmail = Annotated[str, AfterValidator(_check_login_email)]
 
 
 # Request/Response Models
 class UserRegisterRequest(BaseModel):
     email: EmailStr
-    password: str = Field(..., min_length=settings.PASSWORD_MIN_LENGTH)
+    password: str = Field(..., min_length=_PASSWORD_MIN_LENGTH)
     first_name: Optional[str] = Field(None, max_length=100)
     last_name: Optional[str] = Field(None, max_length=100)
     username: Optional[str] = Field(None, min_length=3, max_length=100)
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
-        if len(v) < settings.PASSWORD_MIN_LENGTH:
-            raise ValueError(f'Password must be at least {settings.PASSWORD_MIN_LENGTH} characters')
-        if not any(char.isdigit() for char in v):
+        if len(v) < _PASSWORD_MIN_LENGTH:
+            raise ValueError(f'Password must be at least {_PASSWORD_MIN_LENGTH} characters')
+        if v.isascii():
+            # Scan the bytes in C; non-ASCII input keeps the full Unicode checks
+            encoded = v.encode('ascii')
+            has_digit = bool(encoded.translate(None, _NON_DIGIT_ASCII))
+            has_upper = bool(encoded.translate(None, _NON_UPPER_ASCII))
+        else:
+            has_digit = any(char.isdigit() for char in v)
+            has_upper = any(char.isupper() for char in v)
+        if not has_digit:
             raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
+        if not has_upper:
             raise ValueError('Password must contain at least one uppercase letter')
         return v
 
 
 class UserLoginRequest(BaseModel):
-    email: EmailStr
+    email: LoginEmail
     password: str
     device_name: Optional[str] = None
 
@@ -65,7 +109,7 @@ class TokenResponse(BaseModel):
 
 
 class UserResponse(BaseModel):
-    id: str
+    id: UUID
     email: str
     username: Optional[str]
     first_name: Optional[str]
@@ -76,12 +120,7 @@ class UserResponse(BaseModel):
     is_verified: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
-    
-    @validator('id', pre=True)
-    def convert_uuid_to_string(cls, v):
-        return str(v) if v else v
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdateRequest(BaseModel):
@@ -92,11 +131,15 @@ class UserUpdateRequest(BaseModel):
     timezone: Optional[str] = Field(None, max_length=50)
     locale: Optional[str] = Field(None, max_length=10)
     
-    @validator('phone_number')
+    @field_validator('phone_number')
+    @classmethod
     def validate_phone_number(cls, v):
         if v is not None:
             # Basic phone number validation (can be enhanced)
-            v = ''.join(filter(str.isdigit, v))
+            if v.isascii():
+                v = v.translate(_DROP_NON_DIGITS)
+            else:
+                v = ''.join(filter(str.isdigit, v))
             if len(v) < 10:
                 raise ValueError('Phone number must have at least 10 digits')
         return v
@@ -117,17 +160,21 @@ class AddressRequest(BaseModel):
     label: Optional[str] = Field(None, max_length=50)
     is_primary: bool = Field(default=False)
     
-    @validator('postal_code')
+    @field_validator('postal_code')
+    @classmethod
     def validate_postal_code(cls, v):
-        if not v or len(v.strip()) == 0:
+        v = v.strip()
+        if not v:
             raise ValueError('Postal code is required')
-        return v.strip()
+        return v
     
-    @validator('state_province')
+    @field_validator('state_province')
+    @classmethod
     def validate_state_province(cls, v):
-        if not v or len(v.strip()) == 0:
+        v = v.strip()
+        if not v:
             raise ValueError('State/Province is required')
-        return v.strip()
+        return v
 
 
 class AddressUpdateRequest(BaseModel):
@@ -138,21 +185,29 @@ class AddressUpdateRequest(BaseModel):
     postal_code: Optional[str] = Field(None, max_length=20)
     country: Optional[str] = Field(None, max_length=2)
     
-    @validator('postal_code')
+    @field_validator('postal_code')
+    @classmethod
     def validate_postal_code(cls, v):
-        if v is not None and len(v.strip()) == 0:
+        if v is None:
+            return v
+        v = v.strip()
+        if not v:
             raise ValueError('Postal code cannot be empty')
-        return v.strip() if v else v
+        return v
     
-    @validator('state_province')
+    @field_validator('state_province')
+    @classmethod
     def validate_state_province(cls, v):
-        if v is not None and len(v.strip()) == 0:
+        if v is None:
+            return v
+        v = v.strip()
+        if not v:
             raise ValueError('State/Province cannot be empty')
-        return v.strip() if v else v
+        return v
 
 
 class AddressResponse(BaseModel):
-    id: str
+    id: UUID
     address_line1: str
     address_line2: Optional[str]
     city: str
@@ -166,12 +221,7 @@ class AddressResponse(BaseModel):
     verified: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
-    
-    @validator('id', pre=True)
-    def convert_uuid_to_string(cls, v):
-        return str(v) if v else v
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MessageResponse(BaseModel):
@@ -181,7 +231,7 @@ class MessageResponse(BaseModel):
 class ChangePasswordRequest(BaseModel):
     """Request to change password"""
     old_password: str = Field(..., description="Current password")
-    new_password: str = Field(..., min_length=settings.PASSWORD_MIN_LENGTH)
+    new_password: str = Field(..., min_length=_PASSWORD_MIN_LENGTH)
 
 
 class UpdateUserRoleRequest(BaseModel):
@@ -209,15 +259,52 @@ def get_client_info(request: Request) -> dict:
     }
 
 
+_T = TypeVar("_T")
+
+# Response bodies are encoded straight from the ORM row; orjson handles the UUID,
+# datetime and enum columns itself, so no intermediate Pydantic model is built
+_USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+_ADDRESS_RESPONSE_FIELDS = tuple(AddressResponse.model_fields)
+
+
+def _orm_json(obj: Any, fields: Tuple[str, ...]) -> bytes:
+    """Encode the given attributes of an ORM object as a JSON object"""
+    return orjson.dumps({name: getattr(obj, name) for name in fields}, option=orjson.OPT_UTC_Z)
+
+
+# A returned Response bypasses the route decorator's status_code, so create routes pass theirs here
+def _user_json(user: User, status_code: int = status.HTTP_200_OK) -> Response:
+    """Build a UserResponse-shaped JSON response from a User row"""
+    return Response(
+        content=_orm_json(user, _USER_RESPONSE_FIELDS),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _address_json(address: UserAddress, status_code: int = status.HTTP_200_OK) -> Response:
+    """Build an AddressResponse-shaped JSON response from a UserAddress row"""
+    return Response(
+        content=_orm_json(address, _ADDRESS_RESPONSE_FIELDS),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+async def _in_own_session(operation: Callable[[UserService], Awaitable[_T]]) -> _T:
+    """Run a user service operation on its own DB session, so independent writes can run concurrently"""
+    async with get_async_session() as db:
+        return await operation(UserService(db))
+
+
 # API Endpoints
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserRegisterRequest,
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Register a new user"""
-    user_service = UserService(db)
     
     try:
         user = await user_service.create_user(
@@ -240,7 +327,7 @@ async def register(
             user_agent=client_info["user_agent"],
         )
         
-        return UserResponse.from_orm(user)
+        return _user_json(user, status_code=status.HTTP_201_CREATED)
         
     except UserAlreadyExistsError as e:
         raise HTTPException(
@@ -248,9 +335,7 @@ async def register(
             detail=str(e)
         )
     except Exception as e:
-        import traceback
-        logger.error(f"Registration failed: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Registration failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to register user: {str(e)}"
@@ -261,10 +346,9 @@ async def register(
 async def login(
     credentials: UserLoginRequest,
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Login with email and password"""
-    user_service = UserService(db)
     
     try:
         # Authenticate user
@@ -286,28 +370,29 @@ async def login(
             device_id=credentials.device_name
         )
         
-        # Store refresh token
-        await user_service.create_refresh_token(
-            user_id=user.id,
-            token=refresh_token,
-            token_family=token_family,
-            expires_at=datetime.utcnow() + settings.refresh_token_expire_timedelta,
-            device_name=credentials.device_name
-        )
-        
-        # Create session
+        # Store refresh token and create session; independent inserts, so each
+        # runs on its own session concurrently
         client_info = get_client_info(request)
-        await user_service.create_session(
-            user_id=user.id,
-            ip_address=client_info["ip_address"],
-            user_agent=client_info["user_agent"],
-            device_info={"device_name": credentials.device_name} if credentials.device_name else None
+        await asyncio.gather(
+            _in_own_session(lambda service: service.create_refresh_token(
+                user_id=user.id,
+                token=refresh_token,
+                token_family=token_family,
+                expires_at=datetime.now(_UTC) + _REFRESH_DELTA,
+                device_name=credentials.device_name
+            )),
+            _in_own_session(lambda service: service.create_session(
+                user_id=user.id,
+                ip_address=client_info["ip_address"],
+                user_agent=client_info["user_agent"],
+                device_info={"device_name": credentials.device_name} if credentials.device_name else None
+            )),
         )
         
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            expires_in=_ACCESS_EXPIRES_IN
         )
         
     except InvalidCredentialsError as e:
@@ -338,7 +423,7 @@ async def refresh_token(
         return TokenResponse(
             access_token=access_token,
             refresh_token=new_refresh_token,
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            expires_in=_ACCESS_EXPIRES_IN
         )
         
     except Exception as e:
@@ -351,23 +436,24 @@ async def refresh_token(
 
 @router.post("/logout", response_model=MessageResponse)
 async def logout(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Logout current user (revoke all tokens)"""
-    user_service = UserService(db)
-    
-    # Revoke all user sessions and tokens
-    await user_service.revoke_all_user_sessions(current_user.id)
-    await user_service.revoke_all_user_tokens(current_user.id)
+    user_id = current_user.id
     
-    # Log logout
-    await user_service.create_audit_log(
-        user_id=current_user.id,
-        event_type="user_logout",
-        event_category="auth",
-        event_description="User logged out, all tokens revoked"
+    # Revoke all user sessions and tokens and log the logout; these touch
+    # separate tables, so each runs on its own session concurrently
+    await asyncio.gather(
+        _in_own_session(lambda service: service.revoke_all_user_sessions(user_id)),
+        _in_own_session(lambda service: service.revoke_all_user_tokens(user_id)),
+        _in_own_session(lambda service: service.create_audit_log(
+            user_id=user_id,
+            event_type="user_logout",
+            event_category="auth",
+            event_description="User logged out, all tokens revoked"
+        )),
     )
+    forget_user_claims(str(user_id))
     
     return MessageResponse(message="Successfully logged out")
 
@@ -377,23 +463,23 @@ async def get_current_user_info(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get current user information"""
-    return UserResponse.from_orm(current_user)
+    return _user_json(current_user)
 
 
 @router.put("/profile", response_model=UserResponse)
 async def update_user_profile(
     user_data: UserUpdateRequest,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Update user profile information"""
-    user_service = UserService(db)
     
     try:
         # Only update fields that were provided
-        update_data = user_data.dict(exclude_unset=True)
+        fields_set = user_data.model_fields_set
         
-        if update_data:
+        if fields_set:
+            update_data = user_data.model_dump(include=fields_set)
             updated_user = await user_service.update_user(
                 user_id=current_user.id,
                 **update_data
@@ -407,9 +493,9 @@ async def update_user_profile(
                 event_description="User updated profile information"
             )
             
-            return UserResponse.from_orm(updated_user)
+            return _user_json(updated_user)
         else:
-            return UserResponse.from_orm(current_user)
+            return _user_json(current_user)
             
     except Exception as e:
         raise HTTPException(
@@ -422,21 +508,23 @@ async def update_user_profile(
 async def update_user_email(
     email_data: EmailUpdateRequest,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Update user email address (requires password verification)"""
-    user_service = UserService(db)
     
     try:
-        # Verify current password
-        if not await user_service.verify_password(current_user.id, email_data.password):
+        # Verify the current password against the already-loaded user while
+        # checking whether the new email is taken; the hash runs off the event loop
+        password_ok, existing_user = await asyncio.gather(
+            verify_password_async(email_data.password, current_user.password_hash),
+            user_service.get_by_email(email_data.new_email),
+        )
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid password"
             )
         
-        # Check if new email is already taken
-        existing_user = await user_service.get_by_email(email_data.new_email)
         if existing_user and existing_user.id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -476,10 +564,9 @@ async def update_user_email(
 async def change_password(
     password_data: ChangePasswordRequest,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Change user password"""
-    user_service = UserService(db)
     
     try:
         await user_service.update_password(
@@ -509,10 +596,9 @@ async def change_password(
 async def add_user_address(
     address_data: AddressRequest,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Add a new address for the current user"""
-    user_service = UserService(db)
     
     try:
         address = await user_service.add_address(
@@ -535,7 +621,7 @@ async def add_user_address(
             event_description=f"User added address: {address_data.city}, {address_data.state_province}"
         )
         
-        return AddressResponse.from_orm(address)
+        return _address_json(address, status_code=status.HTTP_201_CREATED)
         
     except Exception as e:
         raise HTTPException(
@@ -547,14 +633,11 @@ async def add_user_address(
 @router.get("/addresses/home", response_model=AddressResponse)
 async def get_user_address(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Get the user's home address"""
-    user_service = UserService(db)
-    
     try:
-        addresses = await user_service.get_user_addresses(current_user.id)
-        home_address = next((addr for addr in addresses if addr.is_primary), None)
+        home_address = await user_service.get_primary_address(current_user.id)
         
         if not home_address:
             raise HTTPException(
@@ -562,7 +645,7 @@ async def get_user_address(
                 detail="No home address found"
             )
         
-        return AddressResponse.from_orm(home_address)
+        return _address_json(home_address)
         
     except HTTPException:
         raise
@@ -577,15 +660,13 @@ async def get_user_address(
 async def update_user_address(
     address_data: AddressUpdateRequest,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Update the user's home address"""
-    user_service = UserService(db)
     
     try:
         # Get current home address
-        addresses = await user_service.get_user_addresses(current_user.id)
-        home_address = next((addr for addr in addresses if addr.is_primary), None)
+        home_address = await user_service.get_primary_address(current_user.id)
         
         if not home_address:
             raise HTTPException(
@@ -594,9 +675,10 @@ async def update_user_address(
             )
         
         # Only update fields that were provided
-        update_data = address_data.dict(exclude_unset=True)
+        fields_set = address_data.model_fields_set
         
-        if update_data:
+        if fields_set:
+            update_data = address_data.model_dump(include=fields_set)
             updated_address = await user_service.update_address(
                 address_id=home_address.id,
                 user_id=current_user.id,
@@ -611,9 +693,9 @@ async def update_user_address(
                 event_description=f"User updated home address: {update_data.get('city', 'Unknown')}, {update_data.get('state_province', 'Unknown')}"
             )
             
-            return AddressResponse.from_orm(updated_address)
+            return _address_json(updated_address)
         else:
-            return AddressResponse.from_orm(home_address)
+            return _address_json(home_address)
             
     except HTTPException:
         raise
@@ -629,10 +711,9 @@ async def update_user_role(
     user_id: str,
     role_data: UpdateUserRoleRequest,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Update user role"""
-    user_service = UserService(db)
     
     try:
         # Get the target user to get their current role
@@ -657,7 +738,7 @@ async def update_user_role(
             user_id=str(updated_user.id),
             old_role=old_role.value,
             new_role=role_data.new_role.value,
-            updated_at=updated_user.updated_at or datetime.utcnow()
+            updated_at=updated_user.updated_at or datetime.now(_UTC)
         )
         
     except ValueError as e:
@@ -666,7 +747,7 @@ async def update_user_role(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Failed to update user role: {str(e)}")
+        logger.error("Failed to update user role: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update user role"
@@ -5,7 +5,8 @@ Cluster management endpoints for MowthosOS API.
 from typing import Dict, Optional, Any, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.api.dependencies import get_cluster_service
 from src.core.auth import get_current_active_user
@@ -17,8 +18,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 router = APIRouter(prefix="/clusters", tags=["clusters"])
 
 # Request/Response Models
+# Request bodies reject unknown keys and are never mutated after validation
+_REQUEST_CONFIG = ConfigDict(extra="forbid", frozen=True)
+
 class CreateClusterRequest(BaseModel):
     """Request model for creating a cluster."""
+    model_config = _REQUEST_CONFIG
+    
     address_id: UUID = Field(..., description="ID of the user's address to use as host")
 
 class CreateClusterResponse(BaseModel):
@@ -32,6 +38,8 @@ class CreateClusterResponse(BaseModel):
 
 class JoinClusterRequest(BaseModel):
     """Request model for joining a cluster."""
+    model_config = _REQUEST_CONFIG
+    
     address_id: UUID = Field(..., description="ID of the user's address")
 
 class JoinClusterResponse(BaseModel):
@@ -80,24 +88,30 @@ class MarketAnalysisResponse(BaseModel):
     market_insights: Optional[Dict[str, Any]] = None
     message: Optional[str] = None
 
+# Response models are filled from the cluster service's own results, so endpoints build them
+# with model_construct and skip validation; only the request models validate input
+def _json_response(model: BaseModel) -> ORJSONResponse:
+    """Encode a response model in a single orjson pass, skipping FastAPI's response_model round trip"""
+    return ORJSONResponse(model.model_dump(mode="json"))
+
+# The neighbor role set is built once rather than per request.
+# The checks stay async: FastAPI runs plain def dependencies in the threadpool.
+_NEIGHBOR_ROLES = frozenset({UserRole.NEIGHBOR, UserRole.USER})
+_HOST_ONLY_DETAIL = "Only Host users can create clusters"
+_NEIGHBOR_ONLY_DETAIL = "Only Neighbor users can join clusters"
+
 # Helper function to verify Host role
 async def get_current_host_user(current_user: User = Depends(get_current_active_user)) -> User:
     """Verify the current user is a Host"""
     if current_user.role != UserRole.HOST:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only Host users can create clusters"
-        )
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=_HOST_ONLY_DETAIL)
     return current_user
 
 # Helper function to verify Neighbor role
 async def get_current_neighbor_user(current_user: User = Depends(get_current_active_user)) -> User:
     """Verify the current user is a Neighbor"""
-    if current_user.role not in [UserRole.NEIGHBOR, UserRole.USER]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only Neighbor users can join clusters"
-        )
+    if current_user.role not in _NEIGHBOR_ROLES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=_NEIGHBOR_ONLY_DETAIL)
     return current_user
 
 @router.post("/create", response_model=CreateClusterResponse)
@@ -116,18 +130,18 @@ async def create_cluster(
         )
         
         if result.get('success'):
-            return CreateClusterResponse(
+            return _json_response(CreateClusterResponse.model_construct(
                 success=True,
                 cluster_id=result.get('cluster_id'),
                 cluster_name=result.get('cluster_name'),
                 host_address=result.get('host_address'),
                 market_analysis=result.get('market_analysis')
-            )
+            ))
         else:
-            return CreateClusterResponse(
+            return _json_response(CreateClusterResponse.model_construct(
                 success=False,
                 message=result.get('message', 'Failed to create cluster')
-            )
+            ))
             
     except Exception as e:
         raise HTTPException(
@@ -153,19 +167,19 @@ async def join_cluster(
         )
         
         if result.get('success'):
-            return JoinClusterResponse(
+            return _json_response(JoinClusterResponse.model_construct(
                 success=True,
                 cluster_id=result.get('cluster_id'),
                 user_id=result.get('user_id'),
                 member_id=result.get('member_id'),
                 join_order=result.get('join_order'),
                 status=result.get('status')
-            )
+            ))
         else:
-            return JoinClusterResponse(
+            return _json_response(JoinClusterResponse.model_construct(
                 success=False,
                 message=result.get('message', 'Failed to join cluster')
-            )
+            ))
             
     except Exception as e:
         raise HTTPException(
@@ -189,17 +203,17 @@ async def leave_cluster(
         )
         
         if result.get('success'):
-            return LeaveClusterResponse(
+            return _json_response(LeaveClusterResponse.model_construct(
                 success=True,
                 cluster_id=result.get('cluster_id'),
                 user_id=result.get('user_id'),
                 left_at=result.get('left_at')
-            )
+            ))
         else:
-            return LeaveClusterResponse(
+            return _json_response(LeaveClusterResponse.model_construct(
                 success=False,
                 message=result.get('message', 'Failed to leave cluster')
-            )
+            ))
             
     except Exception as e:
         raise HTTPException(
@@ -222,7 +236,7 @@ async def get_cluster_details(
         )
         
         if result.get('success'):
-            return ClusterDetailsResponse(
+            return _json_response(ClusterDetailsResponse.model_construct(
                 success=True,
                 cluster_id=result.get('cluster_id'),
                 cluster_name=result.get('cluster_name'),
@@ -238,12 +252,12 @@ async def get_cluster_details(
                 service_radius_meters=result.get('service_radius_meters'),
                 created_at=result.get('created_at'),
                 members=result.get('members')
-            )
+            ))
         else:
-            return ClusterDetailsResponse(
+            return _json_response(ClusterDetailsResponse.model_construct(
                 success=False,
                 message=result.get('message', 'Failed to get cluster details')
-            )
+            ))
             
     except Exception as e:
         raise HTTPException(
@@ -265,13 +279,13 @@ async def get_cluster_market_analysis(
             cluster_id=cluster_id
         )
         
-        return MarketAnalysisResponse(
+        return _json_response(MarketAnalysisResponse.model_construct(
             success=True,
             cluster_id=result.get('cluster_id'),
             existing_platform_users=result.get('existing_platform_users'),
             addressable_market=result.get('addressable_market'),
             market_insights=result.get('market_insights')
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(
@@ -293,12 +307,12 @@ async def get_existing_neighbors(
             cluster_id=cluster_id
         )
         
-        return {
+        return ORJSONResponse({
             "success": True,
-            "cluster_id": str(cluster_id),
+            "cluster_id": cluster_id,
             "neighbors": neighbors,
             "count": len(neighbors)
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -320,11 +334,11 @@ async def get_addressable_market(
             cluster_id=cluster_id
         )
         
-        return {
+        return ORJSONResponse({
             "success": True,
-            "cluster_id": str(cluster_id),
+            "cluster_id": cluster_id,
             "market_analysis": market
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -346,12 +360,12 @@ async def get_qualified_clusters_for_neighbor(
             neighbor_address_id=address_id
         )
         
-        return {
+        return ORJSONResponse({
             "success": True,
-            "address_id": str(address_id),
+            "address_id": address_id,
             "qualified_clusters": clusters,
             "count": len(clusters)
-        }
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
+from src.api.dependencies import get_mower_service
 from src.core.database import get_db
 from src.core.auth import get_current_active_user
 from src.models.database.users import User, UserRole
@@ -138,11 +139,11 @@ async def get_device(
 async def register_device(
     device_data: DeviceRegistrationRequest,
     current_user: User = Depends(get_current_host_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    mower_service: MowerService = Depends(get_mower_service)
 ):
     """Register a new device from the user's Mammotion account"""
     device_service = DeviceService(db)
-    mower_service = MowerService()
     
     try:
         # Authenticate with Mammotion to verify credentials and get device list
@@ -234,11 +235,11 @@ async def remove_device(
 async def get_device_status(
     device_id: str,
     current_user: User = Depends(get_current_host_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    mower_service: MowerService = Depends(get_mower_service)
 ):
     """Get real-time status of a device (with ownership verification)"""
     device_service = DeviceService(db)
-    mower_service = MowerService()
     
     try:
         # Verify device ownership
@@ -256,7 +257,7 @@ async def get_device_status(
                 detail="Device not found"
             )
         
-        # Get real-time status from Mammotion
+        # Get real-time status from Mammotion; the shared service caches it per device
         try:
             status = await mower_service.get_device_status(device.device_name)
             
@@ -3,7 +3,8 @@ Health check endpoints for MowthosOS API.
 """
 
 from fastapi import APIRouter
-from datetime import datetime
+
+from src.utils.clock import coarse_isoformat
 
 router = APIRouter()
 
@@ -13,6 +14,6 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "MowthosOS API",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": coarse_isoformat(),
         "version": "1.0.0"
-    } 
\ No newline at end of file
+    }
@@ -2,6 +2,7 @@
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import secrets
+import time
 import uuid
 import jwt
 from passlib.context import CryptContext
@@ -19,6 +20,15 @@ from src.core.password import hash_password, verify_password
 # JWT Bearer token security
 security = HTTPBearer()
 
+# Decoded access-token claims by raw token, reused briefly to skip re-verifying the signature.
+# Access tokens are not checked against revocation (revoke_all_user_tokens only covers refresh
+# tokens), so a cached entry grants nothing a fresh decode would not. logout still evicts the
+# user's entries through forget_user_claims; any future access-token revocation check must also
+# run on cache hits, or a revoked token keeps passing for up to _CLAIMS_CACHE_TTL.
+_CLAIMS_CACHE_TTL = 15.0
+_CLAIMS_CACHE_MAX = 10_000
+_claims_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
 
 class AuthenticationError(Exception):
     """Authentication related errors"""
@@ -97,6 +107,13 @@ def create_refresh_token(
 
 def decode_access_token(token: str) -> Dict[str, Any]:
     """Decode and validate an access token"""
+    now = time.monotonic()
+    cached = _claims_cache.get(token)
+    if cached is not None:
+        if cached[0] > now:
+            return cached[1]
+        del _claims_cache[token]
+    
     try:
         payload = jwt.decode(
             token, 
@@ -107,6 +124,14 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         if payload.get("type") != "access":
             raise AuthenticationError("Invalid token type")
         
+        # Never keep claims past the token's own expiry
+        ttl = min(_CLAIMS_CACHE_TTL, payload["exp"] - time.time())
+        if ttl > 0:
+            if len(_claims_cache) >= _CLAIMS_CACHE_MAX:
+                # Insertion order approximates age, so drop the oldest entry
+                del _claims_cache[next(iter(_claims_cache))]
+            _claims_cache[token] = (now + ttl, payload)
+        
         return payload
     except jwt.ExpiredSignatureError:
         raise AuthenticationError("Token has expired")
@@ -114,6 +139,13 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         raise AuthenticationError(f"Invalid token: {str(e)}")
 
 
+def forget_user_claims(user_id: str) -> None:
+    """Drop every cached access-token claim set belonging to a user"""
+    stale = [token for token, (_, payload) in _claims_cache.items() if payload.get("sub") == user_id]
+    for token in stale:
+        del _claims_cache[token]
+
+
 def decode_refresh_token(token: str) -> Dict[str, Any]:
     """Decode and validate a refresh token"""
     try:
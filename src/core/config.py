@@ -46,7 +46,9 @@ class Settings(BaseSettings):
     # Server Settings
     HOST: str = Field(default="0.0.0.0")
     PORT: int = Field(default=8000)
-    RELOAD: bool = Field(default=True)
+    RELOAD: bool = Field(default=False)  # development only; uvicorn ignores WORKERS while reloading
+    WORKERS: int = Field(default=1)
+    LIMIT_CONCURRENCY: Optional[int] = Field(default=1024)
     
     # Database
     POSTGRES_USER: str = Field()
@@ -61,7 +63,9 @@ class Settings(BaseSettings):
     DATABASE_MAX_OVERFLOW: int = Field(default=20)
     DATABASE_POOL_TIMEOUT: int = Field(default=30)
     DATABASE_POOL_RECYCLE: int = Field(default=3600)
+    DATABASE_POOL_PRE_PING: bool = Field(default=True)  # replace connections dropped while idle in the pool
     DATABASE_ECHO: bool = Field(default=False)
+    DATABASE_STATEMENT_CACHE_SIZE: int = Field(default=256)  # prepared statements kept per asyncpg connection
     
     # Redis
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine
 )
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
 from sqlalchemy import MetaData
@@ -44,18 +45,31 @@ class DatabaseManager:
     def engine(self) -> AsyncEngine:
         """Get or create the database engine"""
         if self._engine is None:
-            # Use NullPool for serverless/lambda environments
-            poolclass = NullPool if settings.IS_SERVERLESS else None
+            # Use NullPool for serverless/lambda environments; it takes no sizing arguments
+            if settings.IS_SERVERLESS:
+                pool_kwargs = {"poolclass": NullPool}
+            else:
+                pool_kwargs = {
+                    "pool_size": settings.DATABASE_POOL_SIZE,
+                    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+                    "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+                    "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+                    "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+                }
+            
+            url = make_url(self.database_url)
+            if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+                # Keep prepared statements for every hot query on each connection
+                url = url.update_query_dict(
+                    {"prepared_statement_cache_size": str(settings.DATABASE_STATEMENT_CACHE_SIZE)}
+                    | dict(url.query)
+                )
             
             self._engine = create_async_engine(
-                self.database_url,
+                url,
                 echo=settings.DATABASE_ECHO,
                 future=True,
-                pool_size=settings.DATABASE_POOL_SIZE,
-                max_overflow=settings.DATABASE_MAX_OVERFLOW,
-                pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-                pool_recycle=settings.DATABASE_POOL_RECYCLE,
-                poolclass=poolclass,
+                **pool_kwargs,
             )
         return self._engine
     
@@ -102,10 +102,13 @@ class Cluster(Base):
     
     # Relationships
     host_user = relationship("User", back_populates="hosted_clusters")
-    members = relationship("ClusterMember", back_populates="cluster", cascade="all, delete-orphan")
-    devices = relationship("MowerDevice", back_populates="cluster")
-    schedules = relationship("ClusterSchedule", back_populates="cluster", cascade="all, delete-orphan")
-    route_history = relationship("RouteOptimization", back_populates="cluster", cascade="all, delete-orphan")
+    host_address = relationship("UserAddress", foreign_keys=[host_address_id])
+    # passive_deletes: the child FKs are ON DELETE CASCADE / SET NULL, so deleting a cluster
+    # is left to the database instead of loading every child row first
+    members = relationship("ClusterMember", back_populates="cluster", cascade="all, delete-orphan", passive_deletes=True)
+    devices = relationship("MowerDevice", back_populates="cluster", passive_deletes=True)
+    schedules = relationship("ClusterSchedule", back_populates="cluster", cascade="all, delete-orphan", passive_deletes=True)
+    route_history = relationship("RouteOptimization", back_populates="cluster", cascade="all, delete-orphan", passive_deletes=True)
     
     # Constraints and indexes
     __table_args__ = (
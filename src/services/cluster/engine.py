@@ -10,7 +10,8 @@ from uuid import UUID
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, text
+from sqlalchemy import and_, exists, select, text
+from sqlalchemy.orm import joinedload
 from sklearn.neighbors import BallTree
 from geopy.distance import geodesic
 
@@ -28,6 +29,17 @@ RADIUS_METERS = 80
 RADIUS_RADIANS = RADIUS_METERS / EARTH_RADIUS_M
 
 # CSV file paths for addressable market discovery
+def _empty_market() -> Dict[str, Any]:
+    """Zero-filled market result for when the market could not be computed."""
+    return {
+        "total_addresses": 0,
+        "addresses_within_radius": 0,
+        "qualified_addresses": 0,
+        "potential_addresses": [],
+        "market_coverage_percentage": 0,
+        "complete": False,
+    }
+
 ADDRESS_CSV = os.path.join(os.path.dirname(__file__), '../../../Mowthos-Cluster-Logic/olmsted_addresses_559xx.csv')
 
 class ClusterEngine:
@@ -79,7 +91,6 @@ class ClusterEngine:
             Dictionary with registration results
         """
         try:
-            from sqlalchemy import select
             # 1. Verify user role
             stmt = select(User).where(User.id == user_id)
             result = await db.execute(stmt)
@@ -98,13 +109,12 @@ class ClusterEngine:
                 return {"success": False, "message": "Address not found or not owned by user"}
             
             # 3. Check if user already hosts a cluster
-            stmt = select(Cluster).where(
+            stmt = select(exists().where(
                 Cluster.host_user_id == user_id,
                 Cluster.status.in_([ClusterStatus.ACTIVE, ClusterStatus.PENDING])
-            )
+            ))
             result = await db.execute(stmt)
-            existing_cluster = result.scalar_one_or_none()
-            if existing_cluster:
+            if result.scalar():
                 return {"success": False, "message": "User already hosts a cluster"}
             
             # 4. Validate address with Mapbox
@@ -181,77 +191,88 @@ class ClusterEngine:
             List of qualified neighbor addresses with user information
         """
         try:
-            # Get cluster details
-            cluster = db.query(Cluster).filter(Cluster.id == cluster_id).first()
-            if not cluster:
-                logger.warning(f"Cluster {cluster_id} not found")
-                return []
-            
-            # Find verified user addresses within radius
-            query = text("""
-                SELECT 
-                    ua.id,
-                    ua.address_line1,
-                    ua.city,
-                    ua.state_province,
-                    ua.postal_code,
-                    ua.latitude,
-                    ua.longitude,
-                    u.id as user_id,
-                    u.role,
-                    u.display_name,
-                    u.email
-                FROM user_addresses ua
-                JOIN users u ON ua.user_id = u.id
-                WHERE ua.verified = true
-                AND ua.id != :host_address_id
-                AND u.role IN ('neighbor', 'user')
-                AND ST_DWithin(
-                    ST_MakePoint(ua.longitude::float, ua.latitude::float),
-                    ST_MakePoint(:host_lon::float, :host_lat::float),
-                    :radius_meters
-                )
-            """)
-            
-            candidates = db.execute(query, {
-                "host_address_id": cluster.host_address_id,
-                "host_lat": cluster.center_latitude,
-                "host_lon": cluster.center_longitude,
-                "radius_meters": radius_meters
-            }).fetchall()
-            
-            # Road-aware filtering
-            qualified_neighbors = []
-            for candidate in candidates:
-                try:
-                    is_accessible = await mapbox_service.is_accessible_without_crossing_road(
-                        (cluster.center_latitude, cluster.center_longitude),
-                        (float(candidate.latitude), float(candidate.longitude))
-                    )
-                    
-                    if is_accessible:
-                        qualified_neighbors.append({
-                            "address_id": str(candidate.id),
-                            "user_id": str(candidate.user_id),
-                            "address": f"{candidate.address_line1}, {candidate.city}, {candidate.state_province}",
-                            "user_role": candidate.role,
-                            "user_name": candidate.display_name,
-                            "user_email": candidate.email,
-                            "latitude": float(candidate.latitude),
-                            "longitude": float(candidate.longitude),
-                            "source": "platform_user"
-                        })
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Invalid coordinates for address {candidate.id}: {str(e)}")
-                    continue
-            
-            logger.info(f"Found {len(qualified_neighbors)} qualified existing neighbors for cluster {cluster_id}")
-            return qualified_neighbors
-            
+            return await self._find_existing_neighbors(db, cluster_id, mapbox_service, radius_meters)
         except Exception as e:
             logger.error(f"Failed to discover existing neighbors: {str(e)}")
             return []
 
+    async def _find_existing_neighbors(
+        self,
+        db: AsyncSession,
+        cluster_id: UUID,
+        mapbox_service: MapboxService,
+        radius_meters: int
+    ) -> List[Dict[str, Any]]:
+        """Existing-neighbor lookup that raises on query or road-check errors instead of returning []."""
+        # Get cluster details
+        result = await db.execute(select(Cluster).where(Cluster.id == cluster_id))
+        cluster = result.scalar_one_or_none()
+        if not cluster:
+            logger.warning(f"Cluster {cluster_id} not found")
+            return []
+        
+        # Find verified user addresses within radius
+        query = text("""
+            SELECT 
+                ua.id,
+                ua.address_line1,
+                ua.city,
+                ua.state_province,
+                ua.postal_code,
+                ua.latitude,
+                ua.longitude,
+                u.id as user_id,
+                u.role,
+                u.display_name,
+                u.email
+            FROM user_addresses ua
+            JOIN users u ON ua.user_id = u.id
+            WHERE ua.verified = true
+            AND ua.id != :host_address_id
+            AND u.role IN ('neighbor', 'user')
+            AND ST_DWithin(
+                ST_MakePoint(ua.longitude::float, ua.latitude::float),
+                ST_MakePoint(:host_lon::float, :host_lat::float),
+                :radius_meters
+            )
+        """)
+        
+        result = await db.execute(query, {
+            "host_address_id": cluster.host_address_id,
+            "host_lat": cluster.center_latitude,
+            "host_lon": cluster.center_longitude,
+            "radius_meters": radius_meters
+        })
+        candidates = result.fetchall()
+        
+        # Road-aware filtering
+        qualified_neighbors = []
+        for candidate in candidates:
+            try:
+                is_accessible = await mapbox_service.is_accessible_without_crossing_road(
+                    (cluster.center_latitude, cluster.center_longitude),
+                    (float(candidate.latitude), float(candidate.longitude))
+                )
+                
+                if is_accessible:
+                    qualified_neighbors.append({
+                        "address_id": str(candidate.id),
+                        "user_id": str(candidate.user_id),
+                        "address": f"{candidate.address_line1}, {candidate.city}, {candidate.state_province}",
+                        "user_role": candidate.role,
+                        "user_name": candidate.display_name,
+                        "user_email": candidate.email,
+                        "latitude": float(candidate.latitude),
+                        "longitude": float(candidate.longitude),
+                        "source": "platform_user"
+                    })
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Invalid coordinates for address {candidate.id}: {str(e)}")
+                continue
+        
+        logger.info(f"Found {len(qualified_neighbors)} qualified existing neighbors for cluster {cluster_id}")
+        return qualified_neighbors
+
     async def discover_addressable_market_for_host_db(
         self,
         db: AsyncSession,
@@ -270,13 +291,17 @@ class ClusterEngine:
             radius_meters: Search radius in meters
             
         Returns:
-            Dictionary with market analysis
+            Dictionary with market analysis; "complete" is False when the cluster, the
+            address data or any road check was unavailable, so the counts are not final
         """
         try:
-            # Get cluster details
-            cluster = db.query(Cluster).filter(Cluster.id == cluster_id).first()
+            # Get cluster details, with the host address the candidates are compared against
+            result = await db.execute(
+                select(Cluster).options(joinedload(Cluster.host_address)).where(Cluster.id == cluster_id)
+            )
+            cluster = result.scalar_one_or_none()
             if not cluster:
-                return {"total_addresses": 0, "qualified_addresses": 0, "potential_addresses": []}
+                return _empty_market()
             
             # Load address data if not already loaded
             if not self.all_addresses:
@@ -284,7 +309,7 @@ class ClusterEngine:
             
             if not self.all_addresses:
                 logger.warning("No address data available for market discovery")
-                return {"total_addresses": 0, "qualified_addresses": 0, "potential_addresses": []}
+                return _empty_market()
             
             # Build BallTree for all candidates
             candidate_coords = np.array([[c['latitude'], c['longitude']] for c in self.all_addresses])
@@ -297,6 +322,7 @@ class ClusterEngine:
             
             # Road-aware filtering
             qualified_addresses = []
+            unchecked = 0
             for idx in idxs:
                 candidate = self.all_addresses[idx]
                 
@@ -321,6 +347,7 @@ class ClusterEngine:
                         })
                 except Exception as e:
                     logger.warning(f"Failed road-aware check for {candidate['full_address']}: {str(e)}")
+                    unchecked += 1
                     continue
             
             market_coverage = (len(qualified_addresses) / len(self.all_addresses)) * 100 if self.all_addresses else 0
@@ -332,12 +359,13 @@ class ClusterEngine:
                 "addresses_within_radius": len(idxs),
                 "qualified_addresses": len(qualified_addresses),
                 "potential_addresses": qualified_addresses,
-                "market_coverage_percentage": market_coverage
+                "market_coverage_percentage": market_coverage,
+                "complete": unchecked == 0
             }
             
         except Exception as e:
             logger.error(f"Failed to discover addressable market: {str(e)}")
-            return {"total_addresses": 0, "qualified_addresses": 0, "potential_addresses": []}
+            return _empty_market()
 
     async def analyze_cluster_market_db(
         self,
@@ -357,11 +385,12 @@ class ClusterEngine:
             radius_meters: Search radius in meters
             
         Returns:
-            Dictionary with complete market analysis
+            Dictionary with complete market analysis; "complete" is False when either
+            lookup failed, so the analysis is not final
         """
         try:
-            # Get existing platform users
-            existing_neighbors = await self.discover_existing_neighbors_for_host_db(
+            # Get existing platform users; errors fall through to the incomplete result below
+            existing_neighbors = await self._find_existing_neighbors(
                 db, cluster_id, mapbox_service, radius_meters
             )
             
@@ -390,7 +419,8 @@ class ClusterEngine:
                     "platform_adoption_rate": adoption_rate,
                     "growth_potential": growth_potential,
                     "radius_meters": radius_meters
-                }
+                },
+                "complete": market_analysis["complete"]
             }
             
         except Exception as e:
@@ -399,7 +429,8 @@ class ClusterEngine:
                 "cluster_id": str(cluster_id),
                 "existing_platform_users": {"count": 0, "users": []},
                 "addressable_market": {"total_addresses": 0, "qualified_addresses": 0, "potential_addresses": []},
-                "market_insights": {"platform_adoption_rate": 0, "growth_potential": 0, "radius_meters": radius_meters}
+                "market_insights": {"platform_adoption_rate": 0, "growth_potential": 0, "radius_meters": radius_meters},
+                "complete": False
             }
 
     async def find_qualified_host_for_neighbor_db(
@@ -423,10 +454,13 @@ class ClusterEngine:
         """
         try:
             # Get neighbor address details
-            neighbor_address = db.query(UserAddress).filter(
-                UserAddress.id == neighbor_address_id,
-                UserAddress.verified == True
-            ).first()
+            result = await db.execute(
+                select(UserAddress).where(
+                    UserAddress.id == neighbor_address_id,
+                    UserAddress.verified == True
+                )
+            )
+            neighbor_address = result.scalar_one_or_none()
             if not neighbor_address:
                 logger.warning(f"Neighbor address {neighbor_address_id} not found or not verified")
                 return []
@@ -458,11 +492,12 @@ class ClusterEngine:
                 )
             """)
             
-            candidates = db.execute(query, {
+            result = await db.execute(query, {
                 "neighbor_lat": float(neighbor_address.latitude),
                 "neighbor_lon": float(neighbor_address.longitude),
                 "radius_meters": radius_meters
-            }).fetchall()
+            })
+            candidates = result.fetchall()
             
             # Road-aware filtering
             qualified_hosts = []
@@ -7,10 +7,12 @@ import logging
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_
+from sqlalchemy import and_, exists, select
+from sqlalchemy.orm import joinedload, selectinload
 from geopy.distance import geodesic
 
 from ..base import BaseService
+from ..cache.service import CacheService, CacheNamespace
 from .engine import ClusterEngine
 from .mapbox import MapboxService
 from ...models.schemas import (
@@ -18,7 +20,7 @@ from ...models.schemas import (
     ClusterAssignment, ClusterStats, RouteOptimization
 )
 from ...models.database.users import User, UserRole, UserAddress
-from ...models.database.clusters import Cluster as ClusterModel, ClusterStatus
+from ...models.database.clusters import Cluster as ClusterModel, ClusterMember, ClusterStatus, MemberStatus
 from ...core.config import settings
 from ...core.database import get_db
 
@@ -34,6 +36,7 @@ class ClusterService(BaseService):
         # Get the actual string value from SecretStr
         mapbox_token = settings.MAPBOX_ACCESS_TOKEN.get_secret_value() if settings.MAPBOX_ACCESS_TOKEN else None
         self.mapbox = MapboxService(mapbox_token)
+        self.cache_service = CacheService()
         
         # Configuration
         self.max_cluster_capacity = 5
@@ -41,13 +44,34 @@ class ClusterService(BaseService):
         self.max_distance_meters = 80  # 80m radius for neighbors
         self.min_battery_threshold = 20  # Minimum battery % to join work
         
+        # Cached payload lifetimes in seconds; membership changes drop the cluster's entries early
+        self.details_cache_ttl = 60
+        self.market_cache_ttl = 300
+        # The full analysis embeds existing platform users, which change whenever someone nearby
+        # registers or verifies an address; nothing invalidates on that, so it expires quickly
+        self.market_analysis_cache_ttl = 30
+        
     async def initialize(self) -> None:
         """Initialize the cluster service."""
         await super().initialize()
         
+        # Initialize dependent services
+        await self.cache_service.initialize()
+        
         # Load address data for market discovery
         await self.engine.load_address_data()
         
+    async def cleanup(self) -> None:
+        """Cleanup resources."""
+        await self.mapbox.close()
+        await self.cache_service.cleanup()
+        await super().cleanup()
+        
+    async def _invalidate_cluster_cache(self, cluster_id: UUID) -> None:
+        """Drop the cached payloads that depend on a cluster's membership."""
+        await self.cache_service.delete(str(cluster_id), CacheNamespace.CLUSTER_DATA)
+        await self.cache_service.delete(f"{cluster_id}:market", CacheNamespace.CLUSTER_STATS)
+        
     async def create_cluster(
         self,
         db: AsyncSession,
@@ -126,10 +150,21 @@ class ClusterService(BaseService):
         Returns:
             Dictionary with market analysis
         """
+        cache_key = f"{cluster_id}:addressable"
+        cached = await self.cache_service.get(cache_key, CacheNamespace.CLUSTER_STATS)
+        if cached is not None:
+            return cached
+        
         try:
-            return await self.engine.discover_addressable_market_for_host_db(
+            market = await self.engine.discover_addressable_market_for_host_db(
                 db, cluster_id, self.mapbox
             )
+            # Partial or zero-filled results from a failed lookup are returned but not cached
+            if market.get("complete"):
+                await self.cache_service.set(
+                    cache_key, market, CacheNamespace.CLUSTER_STATS, ttl=self.market_cache_ttl
+                )
+            return market
         except Exception as e:
             logger.error(f"Failed to discover addressable market: {str(e)}")
             return {"total_addresses": 0, "qualified_addresses": 0, "potential_addresses": []}
@@ -148,10 +183,20 @@ class ClusterService(BaseService):
         Returns:
             Dictionary with complete market analysis
         """
+        cache_key = f"{cluster_id}:market"
+        cached = await self.cache_service.get(cache_key, CacheNamespace.CLUSTER_STATS)
+        if cached is not None:
+            return cached
+        
         try:
-            return await self.engine.analyze_cluster_market_db(
+            analysis = await self.engine.analyze_cluster_market_db(
                 db, cluster_id, self.mapbox
             )
+            if analysis.get("complete"):
+                await self.cache_service.set(
+                    cache_key, analysis, CacheNamespace.CLUSTER_STATS, ttl=self.market_analysis_cache_ttl
+                )
+            return analysis
         except Exception as e:
             logger.error(f"Failed to analyze cluster market: {str(e)}")
             return {
@@ -203,21 +248,26 @@ class ClusterService(BaseService):
         """
         try:
             # Verify user role
-            user = db.query(User).filter(User.id == user_id).first()
+            result = await db.execute(select(User).where(User.id == user_id))
+            user = result.scalar_one_or_none()
             if not user or user.role not in [UserRole.NEIGHBOR, UserRole.USER]:
                 return {"success": False, "message": "User must be NEIGHBOR or USER role to join clusters"}
             
             # Verify address ownership
-            address = db.query(UserAddress).filter(
-                UserAddress.id == address_id,
-                UserAddress.user_id == user_id,
-                UserAddress.verified == True
-            ).first()
+            result = await db.execute(
+                select(UserAddress).where(
+                    UserAddress.id == address_id,
+                    UserAddress.user_id == user_id,
+                    UserAddress.verified == True
+                )
+            )
+            address = result.scalar_one_or_none()
             if not address:
                 return {"success": False, "message": "Address not found, not owned by user, or not verified"}
             
             # Get cluster details
-            cluster = db.query(ClusterModel).filter(ClusterModel.id == cluster_id).first()
+            result = await db.execute(select(ClusterModel).where(ClusterModel.id == cluster_id))
+            cluster = result.scalar_one_or_none()
             if not cluster:
                 return {"success": False, "message": "Cluster not found"}
             
@@ -231,14 +281,14 @@ class ClusterService(BaseService):
                 return {"success": False, "message": "Cluster is at maximum capacity"}
             
             # Check if user is already a member
-            existing_member = db.query(ClusterModel).join(
-                ClusterModel.members
-            ).filter(
-                ClusterModel.id == cluster_id,
-                ClusterModel.members.any(user_id=user_id)
-            ).first()
-            
-            if existing_member:
+            result = await db.execute(
+                select(exists().where(
+                    ClusterMember.cluster_id == cluster_id,
+                    ClusterMember.user_id == user_id
+                ))
+            )
+            
+            if result.scalar():
                 return {"success": False, "message": "User is already a member of this cluster"}
             
             # Verify the address is within range and accessible
@@ -248,15 +298,15 @@ class ClusterService(BaseService):
             if not cluster_found:
                 return {"success": False, "message": "Address is not within range of this cluster"}
             
-            # Add user to cluster
-            from ...models.database.clusters import ClusterMember, MemberStatus
-            
-            # Get the next join order
-            max_join_order = db.query(ClusterMember.join_order).filter(
-                ClusterMember.cluster_id == cluster_id
-            ).order_by(ClusterMember.join_order.desc()).first()
+            # Add user to cluster, at the next join order
+            result = await db.execute(
+                select(ClusterMember.join_order).where(
+                    ClusterMember.cluster_id == cluster_id
+                ).order_by(ClusterMember.join_order.desc()).limit(1)
+            )
+            max_join_order = result.scalar_one_or_none()
             
-            next_join_order = (max_join_order[0] if max_join_order else 0) + 1
+            next_join_order = (max_join_order or 0) + 1
             
             member = ClusterMember(
                 cluster_id=cluster_id,
@@ -271,7 +321,8 @@ class ClusterService(BaseService):
             # Update cluster member count
             cluster.current_members += 1
             
-            db.commit()
+            await db.commit()
+            await self._invalidate_cluster_cache(cluster_id)
             
             logger.info(f"User {user_id} joined cluster {cluster_id}")
             
@@ -285,7 +336,7 @@ class ClusterService(BaseService):
             }
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Failed to join cluster: {str(e)}")
             return {"success": False, "message": f"Failed to join cluster: {str(e)}"}
 
@@ -306,21 +357,22 @@ class ClusterService(BaseService):
             Dictionary with leave results
         """
         try:
-            from ...models.database.clusters import ClusterMember, MemberStatus
-            
-            # Find the member record
-            member = db.query(ClusterMember).filter(
-                ClusterMember.cluster_id == cluster_id,
-                ClusterMember.user_id == user_id,
-                ClusterMember.status.in_([MemberStatus.ACTIVE, MemberStatus.PENDING])
-            ).first()
+            # Find the member record, loading its cluster in the same query
+            result = await db.execute(
+                select(ClusterMember).options(joinedload(ClusterMember.cluster)).where(
+                    ClusterMember.cluster_id == cluster_id,
+                    ClusterMember.user_id == user_id,
+                    ClusterMember.status.in_([MemberStatus.ACTIVE, MemberStatus.PENDING])
+                )
+            )
+            member = result.scalar_one_or_none()
             
             if not member:
                 return {"success": False, "message": "User is not a member of this cluster"}
             
             # Check if user is the host
-            cluster = db.query(ClusterModel).filter(ClusterModel.id == cluster_id).first()
-            if cluster and cluster.host_user_id == user_id:
+            cluster = member.cluster
+            if cluster.host_user_id == user_id:
                 return {"success": False, "message": "Host cannot leave their own cluster. Transfer ownership first."}
             
             # Update member status
@@ -330,7 +382,8 @@ class ClusterService(BaseService):
             # Update cluster member count
             cluster.current_members -= 1
             
-            db.commit()
+            await db.commit()
+            await self._invalidate_cluster_cache(cluster_id)
             
             logger.info(f"User {user_id} left cluster {cluster_id}")
             
@@ -342,7 +395,7 @@ class ClusterService(BaseService):
             }
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Failed to leave cluster: {str(e)}")
             return {"success": False, "message": f"Failed to leave cluster: {str(e)}"}
 
@@ -360,8 +413,23 @@ class ClusterService(BaseService):
         Returns:
             Dictionary with cluster details
         """
+        cached = await self.cache_service.get(str(cluster_id), CacheNamespace.CLUSTER_DATA)
+        if cached is not None:
+            return cached
+        
         try:
-            cluster = db.query(ClusterModel).filter(ClusterModel.id == cluster_id).first()
+            # Load the host and every member's user with the cluster, instead of one lazy load per member
+            stmt = (
+                select(ClusterModel)
+                .options(
+                    joinedload(ClusterModel.host_user),
+                    joinedload(ClusterModel.host_address),
+                    selectinload(ClusterModel.members).joinedload(ClusterMember.user),
+                )
+                .where(ClusterModel.id == cluster_id)
+            )
+            result = await db.execute(stmt)
+            cluster = result.scalar_one_or_none()
             if not cluster:
                 return {"success": False, "message": "Cluster not found"}
             
@@ -378,7 +446,7 @@ class ClusterService(BaseService):
                         "joined_at": member.joined_at.isoformat()
                     })
             
-            return {
+            details = {
                 "success": True,
                 "cluster_id": str(cluster.id),
                 "cluster_name": cluster.name,
@@ -395,6 +463,10 @@ class ClusterService(BaseService):
                 "created_at": cluster.created_at.isoformat(),
                 "members": members
             }
+            await self.cache_service.set(
+                str(cluster_id), details, CacheNamespace.CLUSTER_DATA, ttl=self.details_cache_ttl
+            )
+            return details
             
         except Exception as e:
             logger.error(f"Failed to get cluster details: {str(e)}")
@@ -19,7 +19,7 @@ from pymammotion.mammotion.devices.mammotion_bluetooth import MammotionBaseBLEDe
 from pymammotion.mammotion.devices.mammotion_cloud import MammotionBaseCloudDevice, MammotionCloud
 from pymammotion.mqtt import MammotionMQTT
 from pymammotion.utility.device_type import DeviceType
-from pymammotion.utility.constant.device_constant import WorkMode, device_mode
+from pymammotion.utility.constant.device_constant import WorkMode
 
 from ..base import BaseService
 from ...models.schemas import (
@@ -28,6 +28,7 @@ from ...models.schemas import (
 )
 from ...core.cache import cache_manager
 from ...core.config import settings
+from ...utils.mower import MOWER_PREFIXES, work_mode_name
 
 logger = logging.getLogger(__name__)
 
@@ -153,7 +154,7 @@ class MowerService(BaseService):
         
         # Get work mode string
         work_mode_code = mower_state.report_data.dev.sys_status
-        work_mode = device_mode(work_mode_code)
+        work_mode = work_mode_name(work_mode_code)
         
         # Get location info
         location = None
@@ -388,35 +389,30 @@ class MowerService(BaseService):
             max_retries=3,
             initial_delay=2.0
         )
-        await asyncio.sleep(0.5)
         
         await self.exponential_backoff(
             lambda: cloud_client.connect(),
             max_retries=3,
             initial_delay=2.0
         )
-        await asyncio.sleep(0.5)
         
         await self.exponential_backoff(
             lambda: cloud_client.login_by_oauth(country_code),
             max_retries=3,
             initial_delay=2.0
         )
-        await asyncio.sleep(0.5)
         
         await self.exponential_backoff(
             lambda: cloud_client.aep_handle(),
             max_retries=3,
             initial_delay=2.0
         )
-        await asyncio.sleep(0.5)
         
         await self.exponential_backoff(
             lambda: cloud_client.session_by_auth_code(),
             max_retries=3,
             initial_delay=2.0
         )
-        await asyncio.sleep(0.5)
         
         await self.exponential_backoff(
             lambda: cloud_client.get_all_error_codes(),
@@ -456,7 +452,7 @@ class MowerService(BaseService):
             
         device_names = []
         for device in cloud_client.devices_by_account_response.data.data:
-            if device.deviceName.startswith(("Luba-", "Yuka-")):
+            if device.deviceName.startswith(MOWER_PREFIXES):
                 mixed_device = self.mammotion.device_manager.get_device(device.deviceName)
                 if mixed_device is None:
                     # Create new device
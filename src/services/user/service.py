@@ -7,7 +7,7 @@ from sqlalchemy import select, update, and_, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.password import hash_password, verify_password
+from src.core.password import hash_password_async, verify_password_async
 from src.models.database import (
     User, UserAddress, UserSession, RefreshToken, 
     APIKey, AuditLog, UserRole
@@ -59,7 +59,7 @@ class UserService:
         # Create user
         user = User(
             email=email,
-            password_hash=hash_password(password),
+            password_hash=await hash_password_async(password),
             first_name=first_name,
             last_name=last_name,
             username=username,
@@ -106,7 +106,7 @@ class UserService:
         if not user:
             raise InvalidCredentialsError("Invalid email or password")
         
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             # Increment failed login attempts
             user.failed_login_attempts += 1
             
@@ -194,10 +194,10 @@ class UserService:
         if not user:
             raise UserNotFoundError(f"User {user_id} not found")
         
-        if not verify_password(old_password, user.password_hash):
+        if not await verify_password_async(old_password, user.password_hash):
             raise InvalidCredentialsError("Invalid current password")
         
-        user.password_hash = hash_password(new_password)
+        user.password_hash = await hash_password_async(new_password)
         user.updated_at = datetime.utcnow()
         
         await self.db.commit()
@@ -216,7 +216,7 @@ class UserService:
         if not user:
             return False
         
-        return verify_password(password, user.password_hash)
+        return await verify_password_async(password, user.password_hash)
     
     async def update_last_activity(self, user_id: str) -> None:
         """Update user's last activity timestamp"""
@@ -541,6 +541,21 @@ class UserService:
         result = await self.db.execute(stmt)
         return result.scalars().all()
     
+    async def get_primary_address(self, user_id: str) -> Optional[UserAddress]:
+        """Get a user's primary address"""
+        stmt = (
+            select(UserAddress)
+            .where(
+                and_(
+                    UserAddress.user_id == user_id,
+                    UserAddress.is_primary == True
+                )
+            )
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
     # Audit logging
     async def create_audit_log(
         self,
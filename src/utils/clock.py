@@ -0,0 +1,38 @@
+"""
+Coarse wall clock shared by the standalone API in main.py and the health routes.
+
+Readings are refreshed on demand, so the clock is correct without a
+background task and whether or not an app lifespan is running.
+"""
+
+import time
+from datetime import datetime
+
+# Seconds a reading is reused before the wall clock is read again
+CLOCK_REFRESH_INTERVAL = 0.1
+
+_refreshed_at = float("-inf")
+_now = datetime.now()
+_now_iso = _now.isoformat()
+
+
+def _refresh() -> None:
+    """Re-read the wall clock if the cached reading is older than CLOCK_REFRESH_INTERVAL."""
+    global _refreshed_at, _now, _now_iso
+    mono = time.monotonic()
+    if mono - _refreshed_at >= CLOCK_REFRESH_INTERVAL:
+        _refreshed_at = mono
+        _now = datetime.now()
+        _now_iso = _now.isoformat()
+
+
+def coarse_now() -> datetime:
+    """Return the current local time, at most CLOCK_REFRESH_INTERVAL old."""
+    _refresh()
+    return _now
+
+
+def coarse_isoformat() -> str:
+    """Return coarse_now() as an ISO string, formatted once per refresh."""
+    _refresh()
+    return _now_iso
@@ -0,0 +1,14 @@
+"""
+Mower helpers shared by the standalone API in main.py and the mower service.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from pymammotion.utility.constant.device_constant import device_mode
+
+# Device name prefixes of the mowers this API manages
+MOWER_PREFIXES: Tuple[str, ...] = ("Luba-", "Yuka-")
+
+# sys_status codes form a small bounded set, so memoize the code -> name lookup
+work_mode_name = lru_cache(maxsize=64)(device_mode)
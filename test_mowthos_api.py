@@ -178,13 +178,12 @@ class MowthosAPITester:
         print(f"  Blade Status: {'Active' if status.get('blade_status') else 'Inactive'}")
         
         # Location
-        location = status.get('location')
-        if location:
+        if status.get('latitude') is not None:
             print(f"\nLocation:")
-            print(f"  Latitude: {location.get('latitude', 'Unknown')}")
-            print(f"  Longitude: {location.get('longitude', 'Unknown')}")
-            print(f"  Position Type: {location.get('position_type', 'Unknown')}")
-            print(f"  Orientation: {location.get('orientation', 'Unknown')}°")
+            print(f"  Latitude: {status.get('latitude', 'Unknown')}")
+            print(f"  Longitude: {status.get('longitude', 'Unknown')}")
+            print(f"  Position Type: {status.get('position_type', 'Unknown')}")
+            print(f"  Orientation: {status.get('orientation', 'Unknown')}°")
         else:
             print(f"\nLocation: Not available")
     
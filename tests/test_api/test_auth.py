@@ -0,0 +1,215 @@
+"""
+Tests for authentication endpoints and request models.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.api.dependencies import get_user_service
+from src.api.main import app
+from src.api.routes.auth import UserLoginRequest, UserRegisterRequest, UserUpdateRequest
+from src.api.routes import auth as auth_routes
+from src.core import auth as core_auth
+from src.core.auth import create_access_token, decode_access_token, get_current_active_user
+from src.models.database import User, UserAddress, UserRole
+
+
+def make_user(**overrides) -> User:
+    """Build an unsaved user with every response field set."""
+    values = dict(
+        id=uuid.uuid4(),
+        email="test@example.com",
+        username=None,
+        first_name="Test",
+        last_name="User",
+        display_name=None,
+        role=UserRole.USER,
+        is_active=True,
+        is_verified=False,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    values.update(overrides)
+    return User(**values)
+
+
+class FakeUserService:
+    """User service double that returns unsaved rows and records audit events."""
+
+    def __init__(self):
+        self.audit_events = []
+
+    async def create_user(self, email, password, first_name=None, last_name=None, username=None, role=UserRole.USER):
+        return make_user(email=email, first_name=first_name, last_name=last_name, username=username, role=role)
+
+    async def add_address(self, user_id, **fields):
+        return UserAddress(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            latitude=None,
+            longitude=None,
+            verified=False,
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            **fields,
+        )
+
+    async def create_audit_log(self, **event):
+        self.audit_events.append(event["event_type"])
+
+
+@pytest.fixture
+def user_service():
+    """Fake user service wired into the app for the duration of a test."""
+    service = FakeUserService()
+    app.dependency_overrides[get_user_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_user_service, None)
+
+
+@pytest.fixture
+def current_user():
+    """Authenticated user wired into the app for the duration of a test."""
+    user = make_user()
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    yield user
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+REGISTER_BODY = {"email": "new@example.com", "password": "Secret123", "first_name": "New"}
+
+ADDRESS_BODY = {
+    "address_line1": "1 Main St",
+    "city": "Springfield",
+    "state_province": " IL ",
+    "postal_code": " 62701 ",
+}
+
+
+def test_register_returns_created(client: TestClient, user_service):
+    """Registering returns 201 with the new user."""
+    response = client.post("/api/v1/auth/register", json=REGISTER_BODY)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["email"] == "new@example.com"
+    assert data["first_name"] == "New"
+    assert data["role"] == "user"
+    assert data["created_at"] == "2025-01-01T00:00:00Z"
+    assert user_service.audit_events == ["user_registered"]
+
+
+@pytest.mark.parametrize("password, message", [
+    ("Sh0rt", "at least"),
+    ("NoDigitsHere", "digit"),
+    ("nouppercase1", "uppercase"),
+    ("ñoupperçase1", "uppercase"),
+])
+def test_register_rejects_weak_password(client: TestClient, user_service, password, message):
+    """Weak passwords fail validation before a user is created."""
+    response = client.post("/api/v1/auth/register", json={**REGISTER_BODY, "password": password})
+
+    assert response.status_code == 422
+    assert message in str(response.json()["detail"])
+    assert user_service.audit_events == []
+
+
+@pytest.mark.parametrize("password", ["Secret123", "Ünïcode123"])
+def test_register_accepts_strong_password(password):
+    """Passwords with a digit and an uppercase letter pass, ASCII or not."""
+    assert UserRegisterRequest(email="new@example.com", password=password).password == password
+
+
+@pytest.mark.parametrize("phone, expected", [
+    ("(555) 123-4567", "5551234567"),
+    ("+1 555 123 4567", "15551234567"),
+    ("５５５１２３４５６７", "５５５１２３４５６７"),
+    (None, None),
+])
+def test_phone_number_keeps_only_digits(phone, expected):
+    """Phone numbers are reduced to their digits."""
+    assert UserUpdateRequest(phone_number=phone).phone_number == expected
+
+
+def test_phone_number_requires_ten_digits():
+    """Phone numbers with fewer than ten digits are rejected."""
+    with pytest.raises(ValidationError, match="at least 10 digits"):
+        UserUpdateRequest(phone_number="555-1234")
+
+
+def test_login_email_lowercases_domain():
+    """Login emails match stored addresses, which have lowercased domains."""
+    request = UserLoginRequest(email="Test.User@Example.COM", password="x")
+
+    assert request.email == "Test.User@example.com"
+
+
+@pytest.mark.parametrize("email", ["not-an-email", "missing@tld", "two@@example.com", "spaces in@example.com"])
+def test_login_rejects_malformed_email(client: TestClient, user_service, email):
+    """Malformed login emails fail validation."""
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "x"})
+
+    assert response.status_code == 422
+
+
+def test_me_reflects_current_user(client: TestClient, current_user):
+    """Each /me response reflects the user as loaded for that request."""
+    first = client.get("/api/v1/auth/me")
+    current_user.first_name = "Renamed"
+    second = client.get("/api/v1/auth/me")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["id"] == str(current_user.id)
+    assert first.json()["first_name"] == "Test"
+    assert second.json()["first_name"] == "Renamed"
+
+
+def test_add_address_returns_created(client: TestClient, user_service, current_user):
+    """Adding an address returns 201 with the stripped address fields."""
+    response = client.post("/api/v1/auth/addresses", json=ADDRESS_BODY)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["state_province"] == "IL"
+    assert data["postal_code"] == "62701"
+    assert data["country"] == "US"
+    assert user_service.audit_events == ["address_added"]
+
+
+@pytest.mark.parametrize("field", ["postal_code", "state_province"])
+def test_add_address_rejects_blank_field(client: TestClient, user_service, current_user, field):
+    """Blank postal codes and states fail validation."""
+    response = client.post("/api/v1/auth/addresses", json={**ADDRESS_BODY, field: "   "})
+
+    assert response.status_code == 422
+    assert user_service.audit_events == []
+
+
+def test_forget_user_claims_drops_only_that_user():
+    """Evicting a user's cached claims leaves other users' entries in place."""
+    token = create_access_token(str(uuid.uuid4()), "user")
+    other = create_access_token(str(uuid.uuid4()), "user")
+    user_id = decode_access_token(token)["sub"]
+    decode_access_token(other)
+
+    core_auth.forget_user_claims(user_id)
+
+    assert token not in core_auth._claims_cache
+    assert other in core_auth._claims_cache
+
+
+def test_logout_evicts_cached_claims(client: TestClient, current_user, monkeypatch):
+    """Logging out drops the user's cached access-token claims."""
+    async def no_db(operation):
+        return None
+
+    monkeypatch.setattr(auth_routes, "_in_own_session", no_db)
+    token = create_access_token(str(current_user.id), "user")
+    decode_access_token(token)
+
+    response = client.post("/api/v1/auth/logout")
+
+    assert response.status_code == 200
+    assert token not in core_auth._claims_cache
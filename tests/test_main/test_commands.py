@@ -0,0 +1,81 @@
+"""
+Tests for the mower API command endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def mower_client():
+    """Test client for the mower control app, without running its lifespan."""
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def sent_commands(monkeypatch):
+    """Record commands passed to the device dispatcher instead of sending them."""
+    sent = []
+
+    async def fake_submit_command(mammotion, device_name, command):
+        sent.append((device_name, command))
+
+    monkeypatch.setattr(main, "submit_command", fake_submit_command)
+    return sent
+
+
+@pytest.mark.parametrize("action, command_sent", [
+    ("start_mowing", "start_job"),
+    ("stop_mowing", "cancel_job"),
+    ("return_to_dock", "return_to_dock"),
+    ("pause_mowing", "pause_execute_task"),
+    ("resume_mowing", "resume_execute_task"),
+])
+def test_command_action(mower_client, sent_commands, sample_device_name, action, command_sent):
+    """Every action is queued for the device and reports the command sent."""
+    response = mower_client.post(f"/command/{action}", json={"device_name": sample_device_name})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["command_sent"] == command_sent
+    assert sent_commands == [(sample_device_name, action)]
+
+
+def test_legacy_route_matches_command_action(mower_client, sent_commands, sample_device_name):
+    """The individual command routes share the /command/{action} handlers."""
+    legacy = mower_client.post("/start-mow", json={"device_name": sample_device_name})
+    generic = mower_client.post("/command/start_mowing", json={"device_name": sample_device_name})
+
+    assert legacy.status_code == generic.status_code == 200
+    assert legacy.json() == generic.json()
+
+
+def test_unknown_command_action(mower_client, sent_commands, sample_device_name):
+    """Unknown actions are rejected before anything is sent."""
+    response = mower_client.post("/command/self_destruct", json={"device_name": sample_device_name})
+
+    assert response.status_code == 422
+    assert sent_commands == []
+
+
+def test_command_requires_device_name(mower_client, sent_commands):
+    """A command body without a device name fails validation."""
+    response = mower_client.post("/command/start_mowing", json={})
+
+    assert response.status_code == 422
+    assert sent_commands == []
+
+
+def test_command_failure(mower_client, monkeypatch, sample_device_name):
+    """A dispatcher failure is reported as a 500 with the action in the detail."""
+    async def failing_submit_command(mammotion, device_name, command):
+        raise RuntimeError("device offline")
+
+    monkeypatch.setattr(main, "submit_command", failing_submit_command)
+    response = mower_client.post("/command/return_to_dock", json={"device_name": sample_device_name})
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to return to dock: device offline"
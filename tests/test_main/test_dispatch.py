@@ -0,0 +1,133 @@
+"""
+Tests for the mower API per-device command dispatcher.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+import main
+
+
+@pytest.fixture
+def mammotion(sample_device_name):
+    """Mammotion client double that knows only the sample device."""
+    return SimpleNamespace(device_manager=SimpleNamespace(has_device=lambda name: name == sample_device_name))
+
+
+@pytest_asyncio.fixture
+async def sent(monkeypatch):
+    """Record commands reaching the device, and stop the dispatchers afterwards."""
+    sent = []
+
+    async def fake_handle_command_with_retry(mammotion, device_name, command):
+        sent.append(command)
+        return command
+
+    monkeypatch.setattr(main, "handle_command_with_retry", fake_handle_command_with_retry)
+    yield sent
+    await main.stop_command_dispatchers()
+
+
+@pytest.mark.asyncio
+async def test_repeated_command_shares_one_send(sent, mammotion, sample_device_name):
+    """Identical commands queued back to back are sent once and share the result."""
+    results = await asyncio.gather(
+        main.submit_command(mammotion, sample_device_name, "start_mowing"),
+        main.submit_command(mammotion, sample_device_name, "start_mowing"),
+    )
+
+    assert sent == ["start_mowing"]
+    assert results == ["start_mowing", "start_mowing"]
+
+
+@pytest.mark.asyncio
+async def test_command_is_not_folded_across_a_different_one(sent, mammotion, sample_device_name):
+    """A repeat after a different command is sent again, keeping submission order."""
+    commands = ["start_mowing", "start_mowing", "stop_mowing", "start_mowing", "start_mowing"]
+    results = await asyncio.gather(
+        *(main.submit_command(mammotion, sample_device_name, command) for command in commands)
+    )
+
+    assert sent == ["start_mowing", "stop_mowing", "start_mowing"]
+    assert results == commands
+
+
+@pytest.mark.asyncio
+async def test_dispatched_command_is_not_joined(sent, mammotion, sample_device_name):
+    """A command submitted after the last one was sent gets its own send."""
+    await main.submit_command(mammotion, sample_device_name, "start_mowing")
+    await main.submit_command(mammotion, sample_device_name, "start_mowing")
+
+    assert sent == ["start_mowing", "start_mowing"]
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_waiting_caller(monkeypatch, sent, mammotion, sample_device_name):
+    """A failed send raises in every caller sharing it."""
+    async def failing_handle_command_with_retry(mammotion, device_name, command):
+        raise RuntimeError("device offline")
+
+    monkeypatch.setattr(main, "handle_command_with_retry", failing_handle_command_with_retry)
+    results = await asyncio.gather(
+        main.submit_command(mammotion, sample_device_name, "return_to_dock"),
+        main.submit_command(mammotion, sample_device_name, "return_to_dock"),
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ["device offline", "device offline"]
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_running_and_queued_commands(monkeypatch, sent, mammotion, sample_device_name):
+    """Stopping the dispatchers cancels the command in flight and those still queued."""
+    async def hanging_handle_command_with_retry(mammotion, device_name, command):
+        sent.append(command)
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(main, "handle_command_with_retry", hanging_handle_command_with_retry)
+    callers = [
+        asyncio.create_task(main.submit_command(mammotion, sample_device_name, command))
+        for command in ("start_mowing", "stop_mowing")
+    ]
+    while not sent:
+        await asyncio.sleep(0)
+
+    await asyncio.wait_for(main.stop_command_dispatchers(), timeout=1)
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert sent == ["start_mowing"]
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert main._cmd_dispatchers == {}
+    assert main._cmd_queues == {}
+    assert main._last_queued == {}
+
+
+@pytest.mark.asyncio
+async def test_unknown_device_creates_no_dispatcher(sent, mammotion):
+    """Commands for unknown devices are rejected before a queue or task exists."""
+    with pytest.raises(main.HTTPException) as excinfo:
+        await main.submit_command(mammotion, "Luba-UNKNOWN", "start_mowing")
+
+    assert excinfo.value.status_code == 404
+    assert sent == []
+    assert main._cmd_queues == {}
+    assert main._cmd_dispatchers == {}
+    assert main._last_queued == {}
+
+
+@pytest.mark.asyncio
+async def test_idle_dispatcher_exits(monkeypatch, sent, mammotion, sample_device_name):
+    """A dispatcher with nothing to send exits and removes its queue."""
+    monkeypatch.setattr(main, "COMMAND_IDLE_TIMEOUT", 0.01)
+    await main.submit_command(mammotion, sample_device_name, "start_mowing")
+    dispatcher = main._cmd_dispatchers[sample_device_name]
+
+    await asyncio.wait_for(dispatcher, timeout=1)
+
+    assert main._cmd_queues == {}
+    assert main._cmd_dispatchers == {}
+    assert await main.submit_command(mammotion, sample_device_name, "stop_mowing") == "stop_mowing"
+    assert sent == ["start_mowing", "stop_mowing"]
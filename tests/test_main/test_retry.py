@@ -0,0 +1,176 @@
+"""
+Tests for the mower API retry helpers.
+"""
+
+import pytest
+
+import main
+from main import RetryBudget, _is_rate_limited, exponential_backoff
+
+
+class StatusError(Exception):
+    """Error carrying an HTTP status code, like most client libraries raise."""
+
+    def __init__(self, status_code):
+        super().__init__(f"request failed with status {status_code}")
+        self.status_code = status_code
+
+
+class ResponseError(Exception):
+    """Error carrying the HTTP response it failed on."""
+
+    def __init__(self, status_code):
+        super().__init__("request failed")
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+class FlakyCall:
+    """Async callable that raises the given errors in turn, then returns a value."""
+
+    def __init__(self, *errors, result="ok"):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting."""
+    recorded = []
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(main.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+@pytest.mark.parametrize("error, expected", [
+    (StatusError(429), True),
+    (StatusError(500), False),
+    (ResponseError(429), True),
+    (ResponseError(503), False),
+    (Exception("429 Too Many Requests"), True),
+    (Exception("connection reset"), False),
+])
+def test_is_rate_limited(error, expected):
+    """Rate limits are detected from status codes, responses and messages."""
+    assert _is_rate_limited(error) is expected
+
+
+def test_status_code_takes_precedence_over_message():
+    """A structured non-429 status is trusted over a message mentioning 429."""
+    error = StatusError(500)
+    error.args = ("upstream said 429",)
+
+    assert _is_rate_limited(error) is False
+
+
+def test_retry_budget_spend_and_exhaust():
+    """A budget is exhausted once every attempt is spent."""
+    budget = RetryBudget(max_attempts=2, max_wall_time=60)
+
+    assert not budget.exhausted
+    budget.spend()
+    assert not budget.exhausted
+    budget.spend()
+    assert budget.exhausted
+    assert 0 < budget.time_left() <= 60
+
+
+def test_retry_budget_deadline():
+    """A budget with no wall time left is exhausted."""
+    budget = RetryBudget(max_attempts=5, max_wall_time=0)
+
+    assert budget.exhausted
+    assert budget.time_left() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_backoff_returns_first_success(sleeps):
+    """A call that succeeds is not retried."""
+    call = FlakyCall()
+
+    assert await exponential_backoff(call) == "ok"
+    assert call.calls == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_backoff_retries_other_errors_once(sleeps):
+    """A non-rate-limit error is retried once without sleeping, then raised."""
+    call = FlakyCall(ValueError("first"), ValueError("second"))
+
+    with pytest.raises(ValueError, match="second"):
+        await exponential_backoff(call, max_retries=5)
+    assert call.calls == 2
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_backoff_recovers_after_one_error(sleeps):
+    """A single non-rate-limit error is retried and the result returned."""
+    call = FlakyCall(ValueError("transient"))
+
+    assert await exponential_backoff(call) == "ok"
+    assert call.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_backoff_sleeps_within_bounds_on_rate_limit(sleeps):
+    """Rate-limit retries sleep with jitter between the initial and max delay."""
+    call = FlakyCall(StatusError(429), StatusError(429), StatusError(429))
+
+    assert await exponential_backoff(call, max_retries=4, initial_delay=0.1, max_delay=0.5) == "ok"
+    assert call.calls == 4
+    assert len(sleeps) == 3
+    assert all(0.1 <= delay <= 0.5 for delay in sleeps)
+
+
+@pytest.mark.asyncio
+async def test_backoff_without_jitter_doubles_delay(sleeps):
+    """Without jitter, rate-limit delays double up to the max delay."""
+    call = FlakyCall(StatusError(429), StatusError(429), StatusError(429))
+
+    await exponential_backoff(call, max_retries=4, initial_delay=0.1, max_delay=0.3, jitter=False)
+    assert sleeps == pytest.approx([0.1, 0.2, 0.3])
+
+
+@pytest.mark.asyncio
+async def test_backoff_raises_after_max_retries(sleeps):
+    """The last rate-limit error is raised once the retries run out."""
+    call = FlakyCall(*(StatusError(429) for _ in range(3)))
+
+    with pytest.raises(StatusError):
+        await exponential_backoff(call, max_retries=3)
+    assert call.calls == 3
+    assert len(sleeps) == 2
+
+
+@pytest.mark.asyncio
+async def test_backoff_stops_when_budget_exhausted(sleeps):
+    """Retries spend from the shared budget and stop when it runs out."""
+    budget = RetryBudget(max_attempts=1, max_wall_time=60)
+    call = FlakyCall(*(StatusError(429) for _ in range(5)))
+
+    with pytest.raises(StatusError):
+        await exponential_backoff(call, max_retries=5, budget=budget)
+    assert call.calls == 2
+    assert budget.remaining == 0
+    assert len(sleeps) == 1
+
+
+@pytest.mark.asyncio
+async def test_backoff_sleep_capped_by_budget_time(sleeps):
+    """A rate-limit sleep never outlasts the budget's deadline."""
+    budget = RetryBudget(max_attempts=5, max_wall_time=0.05)
+    call = FlakyCall(StatusError(429))
+
+    await exponential_backoff(call, initial_delay=1.0, max_delay=2.0, budget=budget)
+    assert sleeps[0] <= 0.05
@@ -0,0 +1,107 @@
+"""
+Tests for the mower API session manager.
+"""
+
+import pytest
+
+import main
+from main import MammotionSessionManager
+
+
+@pytest.fixture
+def manager():
+    """A fresh session manager, independent of the global one."""
+    return MammotionSessionManager()
+
+
+def test_create_session_updates_indexes(manager, sample_account, sample_device_name):
+    """A new session is reachable through every index."""
+    session_id = manager.create_session(sample_account, sample_device_name)
+
+    assert manager.get_session(session_id).account == sample_account
+    assert manager.get_sessions_by_account(sample_account) == {session_id}
+    assert manager.by_device[sample_device_name] == session_id
+    assert manager.by_account_device[(sample_account, sample_device_name)] == session_id
+    assert manager.get_by_device(sample_device_name) is manager.sessions[session_id]
+    assert manager.get_by_account_device(sample_account, sample_device_name) is manager.sessions[session_id]
+
+
+def test_remove_session_clears_indexes(manager, sample_account, sample_device_name):
+    """Removing the only session for an account drops it from every index."""
+    session_id = manager.create_session(sample_account, sample_device_name)
+
+    assert manager.remove_session(session_id) is True
+    assert manager.get_session(session_id) is None
+    assert manager.get_sessions_by_account(sample_account) == set()
+    assert sample_account not in manager.account_index
+    assert sample_device_name not in manager.by_device
+    assert (sample_account, sample_device_name) not in manager.by_account_device
+    assert manager.remove_session(session_id) is False
+
+
+def test_remove_older_session_keeps_newer_device_entry(manager, sample_account, sample_device_name):
+    """The device indexes keep pointing at the newest session when an older one goes."""
+    older = manager.create_session(sample_account, sample_device_name)
+    newer = manager.create_session(sample_account, sample_device_name)
+
+    manager.remove_session(older)
+
+    assert manager.get_sessions_by_account(sample_account) == {newer}
+    assert manager.by_device[sample_device_name] == newer
+    assert manager.by_account_device[(sample_account, sample_device_name)] == newer
+
+
+def test_password_is_encrypted(manager, sample_account, sample_device_name, sample_password):
+    """Passwords are stored encrypted and decrypt back to the original."""
+    session_id = manager.create_session(sample_account, sample_device_name, sample_password)
+    session = manager.get_session(session_id)
+
+    assert session.password is not None
+    assert sample_password.encode() not in session.password
+    assert manager.get_password(session) == sample_password
+
+
+def test_session_without_password(manager, sample_account):
+    """Sessions created without a password store and return None."""
+    session_id = manager.create_session(sample_account)
+    session = manager.get_session(session_id)
+
+    assert session.password is None
+    assert manager.get_password(session) is None
+    assert manager.by_device == {}
+
+
+def test_expired_session_is_removed_on_lookup(manager, monkeypatch, sample_account, sample_device_name):
+    """An expired session is dropped from every index when it is next looked up."""
+    monkeypatch.setattr(main, "SESSION_TTL", 0)
+    session_id = manager.create_session(sample_account, sample_device_name)
+
+    assert manager.get_by_device(sample_device_name) is None
+    assert session_id not in manager.sessions
+    assert manager.get_sessions_by_account(sample_account) == set()
+    assert sample_device_name not in manager.by_device
+
+
+def test_eviction_drops_oldest_session_at_capacity(manager, monkeypatch):
+    """Creating a session at capacity evicts the oldest one."""
+    monkeypatch.setattr(main, "MAX_SESSIONS", 2)
+    first = manager.create_session("first@example.com", "Luba-FIRST")
+    second = manager.create_session("second@example.com", "Luba-SECOND")
+    third = manager.create_session("third@example.com", "Luba-THIRD")
+
+    assert list(manager.sessions) == [second, third]
+    assert first not in manager.sessions
+    assert "first@example.com" not in manager.account_index
+    assert "Luba-FIRST" not in manager.by_device
+
+
+def test_eviction_drops_expired_sessions(manager, monkeypatch):
+    """Expired sessions are evicted when the next session is created."""
+    monkeypatch.setattr(main, "SESSION_TTL", 0)
+    expired = manager.create_session("old@example.com", "Luba-OLD")
+    monkeypatch.setattr(main, "SESSION_TTL", 3600)
+    live = manager.create_session("new@example.com", "Luba-NEW")
+
+    assert list(manager.sessions) == [live]
+    assert expired not in manager.sessions
+    assert "old@example.com" not in manager.account_index
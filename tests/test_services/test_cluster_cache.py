@@ -0,0 +1,223 @@
+"""
+Tests for cluster service caching.
+"""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.database import MemberStatus
+from src.services.cache.service import CacheNamespace
+from src.services.cluster.engine import ClusterEngine
+from src.services.cluster.service import ClusterService
+
+
+class FakeResult:
+    """Query result holding a single row."""
+
+    def __init__(self, row):
+        self.row = row
+
+    def scalar_one_or_none(self):
+        return self.row
+
+
+class FakeSession:
+    """Database session double that answers every query with the same row."""
+
+    def __init__(self, row=None):
+        self.row = row
+        self.queries = 0
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return FakeResult(self.row)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.fixture
+def cluster_id():
+    """A cluster ID with nothing cached for it."""
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Cluster service using its local cache, with market analysis counted instead of computed."""
+    service = ClusterService()
+    service.engine_calls = []
+    service.engine_complete = True
+
+    async def analyze_cluster_market_db(db, cid, mapbox):
+        service.engine_calls.append(("market", cid))
+        return {"cluster_id": str(cid), "run": len(service.engine_calls), "complete": service.engine_complete}
+
+    async def discover_addressable_market_for_host_db(db, cid, mapbox):
+        service.engine_calls.append(("addressable", cid))
+        return {"total_addresses": len(service.engine_calls), "complete": service.engine_complete}
+
+    monkeypatch.setattr(service.engine, "analyze_cluster_market_db", analyze_cluster_market_db)
+    monkeypatch.setattr(
+        service.engine, "discover_addressable_market_for_host_db", discover_addressable_market_for_host_db
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_market_analysis_is_cached(service, cluster_id):
+    """Repeated market analysis for a cluster is served from the cache."""
+    db = FakeSession()
+    first = await service.analyze_cluster_market(db, cluster_id)
+    second = await service.analyze_cluster_market(db, cluster_id)
+
+    assert first == second
+    assert service.engine_calls == [("market", cluster_id)]
+
+
+@pytest.mark.asyncio
+async def test_incomplete_results_are_not_cached(service, cluster_id):
+    """Results the engine could not fully compute are recomputed on the next request."""
+    service.engine_complete = False
+    db = FakeSession()
+    await service.analyze_cluster_market(db, cluster_id)
+    await service.analyze_cluster_market(db, cluster_id)
+    await service.discover_addressable_market(db, cluster_id)
+    await service.discover_addressable_market(db, cluster_id)
+
+    assert service.engine_calls == [
+        ("market", cluster_id),
+        ("market", cluster_id),
+        ("addressable", cluster_id),
+        ("addressable", cluster_id),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_market_analysis_uses_short_ttl(service, cluster_id, monkeypatch):
+    """The analysis, which embeds existing platform users, expires sooner than the addressable market."""
+    ttls = {}
+    cache_set = service.cache_service.set
+
+    async def recording_set(key, value, namespace=None, ttl=None):
+        ttls[key] = ttl
+        return await cache_set(key, value, namespace, ttl=ttl)
+
+    monkeypatch.setattr(service.cache_service, "set", recording_set)
+    db = FakeSession()
+    await service.analyze_cluster_market(db, cluster_id)
+    await service.discover_addressable_market(db, cluster_id)
+
+    assert ttls == {
+        f"{cluster_id}:market": service.market_analysis_cache_ttl,
+        f"{cluster_id}:addressable": service.market_cache_ttl,
+    }
+    assert service.market_analysis_cache_ttl < service.market_cache_ttl
+
+
+@pytest.mark.asyncio
+async def test_engine_marks_missing_cluster_incomplete(cluster_id):
+    """An unknown cluster gives a zero-filled market that is marked incomplete."""
+    engine = ClusterEngine()
+    db = FakeSession(None)
+
+    market = await engine.discover_addressable_market_for_host_db(db, cluster_id, engine.mapbox_service)
+    analysis = await engine.analyze_cluster_market_db(db, cluster_id, engine.mapbox_service)
+
+    assert market["complete"] is False
+    assert market["qualified_addresses"] == 0
+    assert analysis["complete"] is False
+
+
+@pytest.mark.asyncio
+async def test_engine_marks_failed_neighbor_lookup_incomplete(cluster_id):
+    """A failed existing-neighbor query marks the whole analysis incomplete."""
+    class FailingSession(FakeSession):
+        async def execute(self, statement):
+            raise RuntimeError("database unavailable")
+
+    engine = ClusterEngine()
+    analysis = await engine.analyze_cluster_market_db(FailingSession(), cluster_id, engine.mapbox_service)
+
+    assert analysis["complete"] is False
+    assert analysis["existing_platform_users"]["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_market_cache_is_per_cluster(service, cluster_id):
+    """Each cluster gets its own cached market analysis."""
+    other_id = uuid.uuid4()
+    db = FakeSession()
+    await service.analyze_cluster_market(db, cluster_id)
+    await service.analyze_cluster_market(db, other_id)
+
+    assert service.engine_calls == [("market", cluster_id), ("market", other_id)]
+
+
+@pytest.mark.asyncio
+async def test_cached_details_skip_the_database(service, cluster_id):
+    """Cluster details are served from the cache without querying."""
+    db = FakeSession()
+    details = {"success": True, "cluster_id": str(cluster_id), "current_members": 2}
+    await service.cache_service.set(str(cluster_id), details, CacheNamespace.CLUSTER_DATA)
+
+    assert await service.get_cluster_details(db, cluster_id) == details
+    assert db.queries == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_membership_entries(service, cluster_id):
+    """Invalidation drops the cluster's details and market analysis but keeps its addressable market."""
+    db = FakeSession()
+    await service.cache_service.set(str(cluster_id), {"success": True}, CacheNamespace.CLUSTER_DATA)
+    await service.analyze_cluster_market(db, cluster_id)
+    await service.discover_addressable_market(db, cluster_id)
+
+    await service._invalidate_cluster_cache(cluster_id)
+
+    assert await service.cache_service.get(str(cluster_id), CacheNamespace.CLUSTER_DATA) is None
+    await service.analyze_cluster_market(db, cluster_id)
+    await service.discover_addressable_market(db, cluster_id)
+    assert service.engine_calls == [
+        ("market", cluster_id),
+        ("addressable", cluster_id),
+        ("market", cluster_id),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_leave_cluster_invalidates_cache(service, cluster_id):
+    """Leaving a cluster drops its cached details after the change is committed."""
+    user_id = uuid.uuid4()
+    member = SimpleNamespace(
+        status=MemberStatus.ACTIVE,
+        left_at=None,
+        cluster=SimpleNamespace(host_user_id=uuid.uuid4(), current_members=3),
+    )
+    db = FakeSession(member)
+    await service.cache_service.set(str(cluster_id), {"current_members": 3}, CacheNamespace.CLUSTER_DATA)
+
+    result = await service.leave_cluster(db, cluster_id, user_id)
+
+    assert result["success"] is True
+    assert db.commits == 1
+    assert member.cluster.current_members == 2
+    assert await service.cache_service.get(str(cluster_id), CacheNamespace.CLUSTER_DATA) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_leave_keeps_cache(service, cluster_id):
+    """A rejected leave leaves the cached details in place."""
+    db = FakeSession(None)
+    await service.cache_service.set(str(cluster_id), {"current_members": 3}, CacheNamespace.CLUSTER_DATA)
+
+    result = await service.leave_cluster(db, cluster_id, uuid.uuid4())
+
+    assert result["success"] is False
+    assert await service.cache_service.get(str(cluster_id), CacheNamespace.CLUSTER_DATA) == {"current_members": 3}
@@ -0,0 +1,27 @@
+"""
+Tests for the coarse wall clock.
+"""
+
+from datetime import datetime, timedelta
+
+from src.utils import clock
+
+
+def test_reading_is_reused_within_interval(monkeypatch):
+    """Reads within the refresh interval return the same cached value."""
+    monkeypatch.setattr(clock, "_refreshed_at", float("-inf"))
+    first = clock.coarse_now()
+
+    assert clock.coarse_now() is first
+    assert clock.coarse_isoformat() == first.isoformat()
+
+
+def test_reading_refreshes_without_background_task(monkeypatch):
+    """Once the interval has passed the next read sees the current time."""
+    stale = datetime.now() - timedelta(hours=1)
+    monkeypatch.setattr(clock, "_now", stale)
+    monkeypatch.setattr(clock, "_now_iso", stale.isoformat())
+    monkeypatch.setattr(clock, "_refreshed_at", float("-inf"))
+
+    assert clock.coarse_now() > stale + timedelta(minutes=59)
+    assert clock.coarse_isoformat() != stale.isoformat()